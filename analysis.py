@@ -5,29 +5,58 @@ Generate the figures and results for the paper: "The Machine Learning Bazaar:
 Harnessing the ML Ecosystem for Effective System Development"
 """
 
+import argparse
+import cProfile
+import concurrent.futures
+import contextlib
+import fcntl
+import functools
+import gzip
+import hashlib
+import inspect
 import json
+import logging
+import multiprocessing
+import multiprocessing.connection
 import os.path
 import pathlib
+import pickle
+import random
+import re
+import resource
 import shutil
+import sqlite3
 import sys
+import tarfile
+import threading
+import time
 import traceback
 import types
+import urllib.parse
 import warnings
+from collections import deque
 from contextlib import redirect_stderr, redirect_stdout
 from gc import get_referents
 from os import devnull
 from types import FunctionType, ModuleType
 
+import botocore
 import botocore.client
+import botocore.config
+import botocore.exceptions
+import botocore.session
 import funcy as fy
 import matplotlib
 import matplotlib.pyplot as plt
-import mit_d3m.db
+import mit_d3m
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pymongo
 import seaborn as sns
 from pandas.core.common import SettingWithCopyWarning
 from piex.explorer import MongoPipelineExplorer, S3PipelineExplorer
+from pyarrow import feather
 from tqdm import tqdm
 
 warnings.simplefilter('ignore', SettingWithCopyWarning)
@@ -37,6 +66,8 @@ matplotlib.rcParams['pdf.fonttype'] = 42
 matplotlib.rcParams['ps.fonttype'] = 42
 sns.set(context='paper', style='white', font='serif')
 
+logger = logging.getLogger(__name__)
+
 ROOT = pathlib.Path(__file__).parent.resolve()
 OUTPUT_DIR = ROOT.joinpath('output')
 DATA_DIR = ROOT.joinpath('data')
@@ -52,15 +83,96 @@ PIPELINES_BUCKET = 'ml-pipelines-2018'
 MONGO_CONFIG_FILE = str(ROOT.joinpath('mongodb_config.json'))
 
 
-def get_explorer():
+MONGO_CONNECT_TIMEOUT = 5  # seconds
+
+
+def _get_mongo_db(timeout=MONGO_CONNECT_TIMEOUT):
+    """Connect to the database in MONGO_CONFIG_FILE, failing within timeout
+
+    The config file has the same keys as for ``mit_d3m.db.get_db``. Unlike
+    that function, the server is pinged, so that an unreachable server is
+    detected here rather than on the first query.
+    """
+    with open(MONGO_CONFIG_FILE, 'r') as f:
+        config = json.load(f)
+
+    timeout_ms = int(timeout * 1000)
+    client = pymongo.MongoClient(
+        host=config.get('host', 'localhost'),
+        port=config.get('port', 27017),
+        username=config.get('user'),
+        password=config.get('password'),
+        authSource=config.get('auth_database', 'admin'),
+        connectTimeoutMS=timeout_ms,
+        serverSelectionTimeoutMS=timeout_ms,
+    )
+    client.admin.command('ping')
+    return client[config.get('database', 'test')]
+
+
+def get_explorer(timeout=MONGO_CONNECT_TIMEOUT):
     try:
-        db = mit_d3m.db.get_db(config=MONGO_CONFIG_FILE)
+        db = _get_mongo_db(timeout=timeout)
         return MongoPipelineExplorer(db)
     except Exception:
-        return S3PipelineExplorer(PIPELINES_BUCKET)
+        return CachedS3PipelineExplorer(PIPELINES_BUCKET)
 
 
-ex = get_explorer()
+class _ExplorerProvider:
+    """Explorer created on first use and shared by all loaders
+
+    Nothing is connected until an attribute of the explorer is used, so
+    targets that only use local data never wait on the network. A process
+    forked from the one that created the explorer creates its own, since
+    database connections cannot be shared across processes. In offline
+    mode, using the explorer raises, so that only local caches are used,
+    unless an explorer that needs no network has been configured.
+    """
+
+    def __init__(self, offline=False, timeout=MONGO_CONNECT_TIMEOUT):
+        self.offline = offline
+        self.timeout = timeout
+        self._explorer = None
+        self._pid = None
+        self._stand_in = None
+        self._lock = threading.Lock()
+
+    def configure(self, offline=None, timeout=None, explorer=None):
+        """Configure the explorer
+
+        Args:
+            offline (bool, optional): whether to never connect to Mongo or S3
+            timeout (float, optional): seconds to wait for Mongo
+            explorer (optional): explorer to use instead of connecting, such
+                as an in-process stand-in
+        """
+        with self._lock:
+            if offline is not None:
+                self.offline = offline
+            if timeout is not None:
+                self.timeout = timeout
+            self._explorer = None
+            self._stand_in = explorer
+
+    def get(self):
+        if self._stand_in is not None:
+            return self._stand_in
+        if self.offline:
+            raise RuntimeError(
+                'The pipeline explorer is not available in offline mode')
+        with self._lock:
+            if self._explorer is None or self._pid != os.getpid():
+                self._explorer = get_explorer(timeout=self.timeout)
+                self._pid = os.getpid()
+            return self._explorer
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+
+ex = _ExplorerProvider()
 
 
 # Source: https://stackoverflow.com/a/30316760
@@ -70,8 +182,94 @@ ex = get_explorer()
 BLACKLIST = type, ModuleType, FunctionType
 
 
-def getsize(obj):
-    """sum size of object & members."""
+def _sizeof_objects(values, sample=None):
+    """Sum the sizes of the elements of an object array
+
+    If sample is given and there are more elements than that, the size is
+    extrapolated from a fixed random sample of that many elements.
+    """
+    n = len(values)
+    if sample is not None and n > sample:
+        idx = np.random.RandomState(0).choice(n, size=sample, replace=False)
+        return int(np.mean([sys.getsizeof(v) for v in values[idx]]) * n)
+    return sum(map(sys.getsizeof, values))
+
+
+def _sizeof_ndarray(arr, sample=None):
+    # ndarrays have no gc referents, so this is exactly what the walk counts
+    return sys.getsizeof(arr)
+
+
+def _deep_memory_usage(obj, sample=None):
+    """Deep memory usage of a pandas object, which is its __sizeof__
+
+    If sample is given, the size of the elements of object arrays longer than
+    that is extrapolated from a sample.
+    """
+    if sample is None:
+        return int(np.sum(obj.memory_usage(deep=True)))
+
+    if isinstance(obj, pd.Index):
+        shallow = obj.memory_usage()
+        arrays = [obj.values]
+    elif isinstance(obj, pd.Series):
+        shallow = obj.memory_usage(index=True)
+        arrays = [obj.values, obj.index.values]
+    else:
+        shallow = obj.memory_usage(index=True).sum()
+        arrays = [obj[c].values for c in obj.columns if obj[c].dtype == object]
+        arrays.append(obj.index.values)
+    return int(shallow + sum(
+        _sizeof_objects(a, sample=sample)
+        for a in arrays
+        if a.dtype == object
+    ))
+
+
+def _sizeof_pandas(obj, sample=None):
+    """Size of a pandas object as the referents walk counts it
+
+    pandas defines __sizeof__ as the deep memory usage, and the walk then
+    counts the values a second time through the arrays held by the blocks.
+    The deep memory usage of a frame is computed from a Series per column,
+    which the frame caches and the walk counts too, with its deep memory
+    usage. All terms are kept so that results stay comparable with the walk.
+    """
+    if isinstance(obj, pd.Index):
+        values = obj.memory_usage()
+    elif isinstance(obj, pd.Series):
+        values = obj.memory_usage(index=False)
+    else:
+        values = obj.memory_usage(index=False).sum()
+
+    size = _deep_memory_usage(obj, sample=sample) + values
+    if isinstance(obj, pd.DataFrame):
+        size += sum(
+            _deep_memory_usage(column, sample=sample)
+            for _, column in obj.items()
+        )
+    return int(size)
+
+
+_SIZEOF_HANDLERS = (
+    (np.ndarray, _sizeof_ndarray),
+    ((pd.DataFrame, pd.Series, pd.Index), _sizeof_pandas),
+)
+
+
+def getsize(obj, sample=None):
+    """sum size of object & members.
+
+    NumPy arrays and pandas objects are measured directly from their buffers
+    rather than walked, and everything else is walked through its gc
+    referents. Arrays are measured exactly as by the walk, and pandas objects
+    within 16 KiB of it, plus up to 2 KiB per column of a frame for the
+    Series and blocks that hold its cached columns, which are not counted.
+
+    Args:
+        sample (int, optional): extrapolate the size of the elements of object
+            columns longer than this from a sample of that many elements
+    """
     if isinstance(obj, BLACKLIST):
         raise TypeError(
             'getsize() does not take argument of type: ' + str(type(obj)))
@@ -83,8 +281,13 @@ def getsize(obj):
         for obj in objects:
             if not isinstance(obj, BLACKLIST) and id(obj) not in seen_ids:
                 seen_ids.add(id(obj))
-                size += sys.getsizeof(obj)
-                need_referents.append(obj)
+                for types_, handler in _SIZEOF_HANDLERS:
+                    if isinstance(obj, types_):
+                        size += handler(obj, sample=sample)
+                        break
+                else:
+                    size += sys.getsizeof(obj)
+                    need_referents.append(obj)
         objects = get_referents(*need_referents)
     return size
 
@@ -98,6 +301,164 @@ def quiet(call):
                 return call()
 
 
+def requires(*loaders):
+    """Declare the loaders whose data a target or loader uses
+
+    main() runs each declared loader once before running the targets that
+    need it, so that targets running in parallel share the loaded data.
+    """
+    def decorator(func):
+        func.requires = loaders
+        return func
+    return decorator
+
+
+def reads(*paths):
+    """Declare the data files, relative to DATA_DIR, that a loader reads
+
+    The contents of the files fingerprint the data of the loader, so that
+    targets whose data and code are unchanged are not run again.
+    """
+    def decorator(func):
+        func.reads = paths
+        return func
+    return decorator
+
+
+def writes(*paths):
+    """Declare the output files, relative to OUTPUT_DIR, that a target writes
+
+    A figure is declared as ``'{name}.{fmt}'``, for each of the formats it is
+    saved in. Targets whose output files are missing are run again.
+    """
+    def decorator(func):
+        func.writes = paths
+        return func
+    return decorator
+
+
+# Python 3.6 has no per-thread CPU clock
+_thread_time = getattr(time, 'thread_time', time.process_time)
+
+
+class _Tracer:
+    """Record timing spans as json lines
+
+    Each span records its wall time, the CPU time of its thread, the peak RSS
+    of the process once it ends, and the rows of its result. Spans nest
+    within a thread, and the processes running targets append to the same
+    file. Nothing is recorded until a path is configured.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.run = None
+        self._local = threading.local()
+
+    def configure(self, path, run=None):
+        self.path = path
+        self.run = run or time.strftime('%Y%m%dT%H%M%S')
+        if path is not None:
+            pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    @contextlib.contextmanager
+    def span(self, name, **fields):
+        """Record a span around the block, which can add fields to it"""
+        record = dict(fields)
+        if self.path is None:
+            yield record
+            return
+
+        stack = self._local.__dict__.setdefault('stack', [])
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.time()
+        wall = time.perf_counter()
+        cpu = _thread_time()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            stack.pop()
+            record.update(
+                run=self.run,
+                pid=os.getpid(),
+                thread=threading.current_thread().name,
+                name=name,
+                parent=parent,
+                start=start,
+                wall=time.perf_counter() - wall,
+                cpu=_thread_time() - cpu,
+                # in KiB, of the whole process
+                peak_rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            )
+            self._write(record)
+
+    def _write(self, record):
+        line = (json.dumps(record, default=str) + '\n').encode()
+        # a single write to a file opened for appending is not interleaved
+        # with the writes of other threads and processes
+        fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+tracer = _Tracer()
+
+
+def _count_rows(result):
+    if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(result)
+    return None
+
+
+def traced(func):
+    """Record a span for each call of func"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with tracer.span(func.__name__) as span:
+            result = func(*args, **kwargs)
+            span['rows'] = _count_rows(result)
+            return result
+    return wrapper
+
+
+def memoize(func):
+    """Like fy.memoize, also recording a span for each call
+
+    The span records whether the call hit the memory of previous calls.
+    Calls hold a lock of the function, so that the loaders running in
+    threads wait for a result being computed instead of computing it again.
+    """
+    memoized = fy.memoize(func)
+    # reentrant, in case the function calls itself
+    lock = threading.RLock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with lock, tracer.span(func.__name__) as span:
+            n_memorized = len(memoized.memory)
+            result = memoized(*args, **kwargs)
+            hit = len(memoized.memory) == n_memorized
+            span['cache'] = 'hit' if hit else 'miss'
+            span['rows'] = _count_rows(result)
+            return result
+
+    def invalidate(*args, **kwargs):
+        # the key that fy.memoize stores the result of a call under
+        key = args + tuple(sorted(kwargs.items())) if kwargs else args
+        memoized.memory.pop(key, None)
+
+    wrapper.memory = memoized.memory
+    wrapper.invalidate = invalidate
+    wrapper.invalidate_all = memoized.memory.clear
+    return wrapper
+
+
 # Source: https://stackoverflow.com/a/1094933
 def sizeof_fmt(num, suffix='B'):
     for unit in ['', 'Ki', 'Mi', 'Gi', 'Ti', 'Pi', 'Ei', 'Zi']:
@@ -107,6 +468,227 @@ def sizeof_fmt(num, suffix='B'):
     return "%.1f%s%s" % (num, 'Yi', suffix)
 
 
+# ------------------------------------------------------------------------------
+# S3 objects
+# ------------------------------------------------------------------------------
+
+S3_MAX_WORKERS = 16
+S3_MAX_ATTEMPTS = 5
+S3_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+
+_S3_RETRYABLE_CODES = {
+    'RequestTimeout', 'RequestTimeoutException', 'SlowDown', 'Throttling',
+    'ThrottlingException', 'InternalError', 'ServiceUnavailable',
+}
+_S3_RETRYABLE_ERRORS = (
+    botocore.exceptions.EndpointConnectionError,
+    botocore.exceptions.ConnectionClosedError,
+    botocore.exceptions.ConnectTimeoutError,
+    botocore.exceptions.ReadTimeoutError,
+)
+
+
+def _is_retryable(error):
+    """Whether a failed S3 request is worth retrying"""
+    if isinstance(error, _S3_RETRYABLE_ERRORS):
+        return True
+    if isinstance(error, botocore.exceptions.ClientError):
+        response = error.response
+        code = response.get('Error', {}).get('Code')
+        status = response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return code in _S3_RETRYABLE_CODES or status >= 500
+    return False
+
+
+class S3ObjectStore:
+    """Fetch the objects of a bucket concurrently into a local cache
+
+    Objects are stored under the sha256 of their contents, and an index maps
+    each key to the digest of its object, so each key is downloaded once and
+    identical objects are stored once. All the threads share one client,
+    whose connection pool is as large as the thread pool, and transient
+    errors are retried with exponential backoff.
+    """
+
+    def __init__(self, bucket, cache_dir=None, max_workers=S3_MAX_WORKERS,
+                 client=None):
+        self.bucket = bucket
+        self.cache_dir = pathlib.Path(
+            cache_dir or DATA_DIR.joinpath('cache', 's3'))
+        self.max_workers = max_workers
+        self._client = client
+        self._index = None
+        self._index_changed = False
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                config = botocore.config.Config(
+                    signature_version=botocore.UNSIGNED,
+                    max_pool_connections=self.max_workers,
+                    # retried in _get_object, with backoff
+                    retries={'max_attempts': 0},
+                )
+                session = botocore.session.get_session()
+                self._client = session.create_client('s3', config=config)
+            return self._client
+
+    def _get_index_path(self):
+        return self.cache_dir.joinpath('index.json')
+
+    def _get_index(self):
+        with self._lock:
+            if self._index is None:
+                path = self._get_index_path()
+                if path.exists():
+                    with path.open('r') as f:
+                        self._index = json.load(f)
+                else:
+                    self._index = {}
+            return self._index
+
+    def _save_index(self):
+        """Merge the index into the one on disk, under an exclusive lock
+
+        Other processes sharing the cache may have saved keys since the
+        index was read, so the index on disk is read again and updated
+        rather than overwritten, and replaced atomically.
+        """
+        path = self._get_index_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name('{}.{}.tmp'.format(path.name, os.getpid()))
+        with self._lock:
+            index = dict(self._index)
+            self._index_changed = False
+
+        with path.with_name(path.name + '.lock').open('w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if path.exists():
+                with path.open('r') as f:
+                    index = dict(json.load(f), **index)
+            with tmp_path.open('w') as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+            os.replace(str(tmp_path), str(path))
+
+        with self._lock:
+            for key, digest in index.items():
+                self._index.setdefault(key, digest)
+
+    def _get_object_path(self, digest):
+        return self.cache_dir.joinpath('objects', digest[:2], digest)
+
+    def _get_object(self, key):
+        """Download the object of key, retrying transient errors"""
+        for attempt in range(S3_MAX_ATTEMPTS):
+            try:
+                response = self.client.get_object(Bucket=self.bucket, Key=key)
+                return response['Body'].read()
+            except Exception as e:
+                if attempt == S3_MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise
+            # full jitter, so that throttled threads do not retry together
+            time.sleep(random.uniform(0, S3_BACKOFF * 2 ** attempt))
+
+    def _fetch(self, key):
+        index_key = '{}/{}'.format(self.bucket, key)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # threads asking for the same key wait for a single download
+        with key_lock:
+            digest = self._get_index().get(index_key)
+            if digest is not None:
+                path = self._get_object_path(digest)
+                if path.exists():
+                    return path
+
+            body = self._get_object(key)
+            digest = hashlib.sha256(body).hexdigest()
+            path = self._get_object_path(digest)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name('{}.{}.{}.tmp'.format(
+                    digest, os.getpid(), threading.get_ident()))
+                tmp_path.write_bytes(body)
+                os.replace(str(tmp_path), str(path))
+
+            with self._lock:
+                self._index[index_key] = digest
+                self._index_changed = True
+            return path
+
+    def fetch(self, keys):
+        """Fetch keys into the cache
+
+        Returns:
+            dict: the path of the cached object of each key
+        """
+        keys = list(dict.fromkeys(keys))
+        paths = {}
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as pool:
+            futures = {pool.submit(self._fetch, key): key for key in keys}
+            progress = tqdm(
+                concurrent.futures.as_completed(futures), total=len(keys),
+                desc='Fetching s3://{}'.format(self.bucket), unit=' objects',
+                disable=len(keys) < 2)
+            try:
+                for future in progress:
+                    paths[futures[future]] = future.result()
+            finally:
+                if self._index_changed:
+                    self._save_index()
+
+        return paths
+
+
+class CachedS3PipelineExplorer(S3PipelineExplorer):
+    """S3 explorer that fetches its objects through an S3ObjectStore
+
+    Each table is downloaded on the first load of that table, and
+    ``load_pipelines`` downloads many pipelines at once.
+    """
+
+    def __init__(self, bucket, *args, store=None, **kwargs):
+        super().__init__(bucket, *args, **kwargs)
+        self.store = store or S3ObjectStore(bucket)
+
+    @staticmethod
+    def _get_table_key(table_name):
+        return 'csvs/{}.csv.gz'.format(table_name)
+
+    @staticmethod
+    def _get_json_key(folder, name):
+        return '{}/{}.json.gz'.format(folder, name)
+
+    def _get_table(self, table_name):
+        key = self._get_table_key(table_name)
+        path = self.store.fetch([key])[key]
+        return pd.read_csv(path, compression='gzip')
+
+    def _get_json(self, folder, pipeline_id):
+        return self._get_jsons(folder, [pipeline_id])[pipeline_id]
+
+    def _get_jsons(self, folder, names):
+        keys = {name: self._get_json_key(folder, name) for name in names}
+        paths = self.store.fetch(keys.values())
+        jsons = {}
+        for name, key in keys.items():
+            with gzip.open(str(paths[key]), 'rt') as f:
+                jsons[name] = json.load(f)
+        return jsons
+
+    def load_pipelines(self, pipeline_ids):
+        """Load many pipelines, fetching them concurrently
+
+        Returns:
+            dict: the pipeline of each id
+        """
+        return self._get_jsons('pipelines', pipeline_ids)
+
+
 # ------------------------------------------------------------------------------
 # Load data
 # ------------------------------------------------------------------------------
@@ -115,37 +697,641 @@ N_TASKS = 456
 TEST_ID_START = '20181024200501872083'
 
 
-def _get_filters():
-    return {'test_id': {'$gte': TEST_ID_START}}
+def _get_filters(since=None):
+    """Get the analysis-specific test_id filter
+
+    Args:
+        since (str, optional): only match test_ids from this one onwards
+    """
+    test_id_start = max(TEST_ID_START, since or TEST_ID_START)
+    return {'test_id': {'$gte': test_id_start}}
 
 
 def _assert_filters(df):
     assert (df['test_id'].dropna() >= TEST_ID_START).all()
 
 
+# string columns with at most this fraction of distinct values are stored as
+# categoricals, and the columns in INTERNED_COLUMNS are always stored as such
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+INTERNED_COLUMNS = ('pipeline',)
+
+
+@traced
+def _compact_df(df, name=None):
+    """Convert repeated strings to categoricals and downcast integers, in place
+
+    A categorical holds an integer code per row and a lookup table of the
+    distinct values, so string methods such as ``str.contains`` scan each
+    distinct value once. Floats are kept as float64, since pandas reduces
+    float32 columns, e.g. in ``sum`` and ``std``, in float32.
+
+    Args:
+        df (pd.DataFrame): frame to compact
+        name (str, optional): if given, log the memory usage before and
+            after under this name
+    """
+    if name is not None:
+        before = df.memory_usage(deep=True).sum()
+
+    for column in df.columns:
+        values = df[column]
+        kind = values.dtype.kind
+        if kind == 'O':
+            if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+                continue
+            n_unique = values.nunique()
+            if (column in INTERNED_COLUMNS
+                    or n_unique <= CATEGORICAL_MAX_UNIQUE_RATIO * len(values)):
+                df[column] = values.astype('category')
+        elif kind in 'iu':
+            df[column] = pd.to_numeric(
+                values, downcast='integer' if kind == 'i' else 'unsigned')
+
+    if name is not None:
+        after = df.memory_usage(deep=True).sum()
+        logger.info('Compacted %s: %s -> %s',
+                    name, sizeof_fmt(before), sizeof_fmt(after))
+
+    return df
+
+
 def _clear_cache():
     path = DATA_DIR.joinpath('cache')
     shutil.rmtree(path)
 
 
-@fy.memoize
-def _load_pipelines_df(force_download=False):
-    """Get all pipelines, passing the analysis-specific test_id filter"""
-    path = DATA_DIR.joinpath('cache', 'pipelines.pkl.gz')
-    if force_download or not path.exists():
+# The pipelines cache is a directory of uncompressed Feather (Arrow IPC)
+# files, one directory per dataset, so that loads can memory-map the files and
+# read only the columns they need. The manifest lists the files of each
+# partition and is replaced atomically, so it is the authority on what the
+# cache contains. It also records which columns are stored as json, which is
+# decided when a column is first cached and applies to all of its files.
+# Downloads and incremental syncs append one delta file per batch to the
+# partitions, and compact them once they are done: a download merges each
+# partition into one file, and a sync only the partitions that accumulated more
+# than PIPELINES_CACHE_MAX_PARTS files, so that each pipeline is only rewritten
+# a bounded number of times.
+PIPELINES_CACHE_FORMAT_VERSION = 3
+PIPELINES_CACHE_MAX_PARTS = 8
+_NULL_PARTITION = '__null__'
+
+
+def _get_pipelines_cache_dir():
+    return DATA_DIR.joinpath('cache', 'pipelines')
+
+
+def _get_legacy_pipelines_cache_path():
+    return DATA_DIR.joinpath('cache', 'pipelines.pkl.gz')
+
+
+def _get_partition_name(dataset):
+    if pd.isnull(dataset):
+        dataset = _NULL_PARTITION
+    return 'dataset=' + urllib.parse.quote(str(dataset), safe='')
+
+
+def _read_manifest(cache_dir):
+    path = cache_dir.joinpath('_manifest.json')
+    if not path.exists():
+        return None
+    with path.open('r') as f:
+        manifest = json.load(f)
+
+    if manifest['version'] < 2:
+        # version 1 caches were never appended to, so list the files on disk
+        manifest['partitions'] = {
+            name: sorted(p.name for p in cache_dir.joinpath(name).glob(
+                'part-*.feather'))
+            for name in manifest['partitions']
+        }
+        manifest['next_part'] = 1
+        manifest['watermark'] = None
+
+    if manifest['version'] < 3:
+        # version 2 caches recorded the json columns in the metadata of each
+        # file, and the other columns of string type are stored as strings
+        manifest['json_columns'] = []
+        manifest['string_columns'] = []
+        for name, filenames in manifest['partitions'].items():
+            for filename in filenames:
+                path = str(cache_dir.joinpath(name, filename))
+                schema = pa.ipc.open_file(pa.memory_map(path)).schema
+                json_columns = json.loads(
+                    (schema.metadata or {}).get(b'json_columns', b'[]'))
+                manifest['json_columns'] += [
+                    c for c in json_columns
+                    if c not in manifest['json_columns']]
+                manifest['string_columns'] += [
+                    field.name for field in schema
+                    if field.type == pa.string()
+                    and field.name not in json_columns
+                    and field.name not in manifest['string_columns']]
+        manifest['version'] = PIPELINES_CACHE_FORMAT_VERSION
+
+    return manifest
+
+
+def _write_manifest(cache_dir, manifest):
+    path = cache_dir.joinpath('_manifest.json')
+    tmp_path = path.with_name(path.name + '.tmp')
+    with tmp_path.open('w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(str(tmp_path), str(path))
+
+
+def _get_json_columns(df):
+    """Get the object columns of df holding values other than strings"""
+    return [
+        column for column in df.columns
+        if df[column].dtype == object
+        and not df[column].dropna().map(lambda v: isinstance(v, str)).all()
+    ]
+
+
+def _update_json_columns(manifest, df):
+    """Record how the object columns of df that are new to the cache are stored
+
+    Raises:
+        ValueError: if df holds other values than strings in a column that
+            is cached as strings
+    """
+    json_columns = _get_json_columns(df)
+    for column in json_columns:
+        if column in manifest['string_columns']:
+            raise ValueError(
+                f'Column {column} of the pipelines cache holds strings and '
+                'cannot hold other values; rebuild it with force_download')
+        if column not in manifest['json_columns']:
+            manifest['json_columns'].append(column)
+    manifest['string_columns'] += [
+        column for column in df.columns
+        if df[column].dtype == object and df[column].notnull().any()
+        and column not in json_columns
+        and column not in manifest['json_columns']
+        and column not in manifest['string_columns']
+    ]
+
+
+def _to_arrow_table(df, json_columns=None):
+    """Convert df to an Arrow table, json-encoding non-string object columns
+
+    Columns such as hyperparameters hold nested, heterogeneous objects that
+    Arrow cannot infer a type for. These are stored as json strings and the
+    names of such columns are recorded in the schema metadata.
+
+    Args:
+        json_columns (list[str], optional): columns to json-encode, strings
+            included. Defaults to the object columns holding other values.
+    """
+    df = df.reset_index(drop=True)
+    if json_columns is None:
+        json_columns = _get_json_columns(df)
+    json_columns = [column for column in json_columns if column in df]
+    for column in json_columns:
+        df[column] = df[column].map(
+            lambda v: v if pd.isnull(v) else json.dumps(v, default=str))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'json_columns'] = json.dumps(json_columns).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def _from_arrow_table(table, json_columns=None):
+    """Convert an Arrow table to a frame, decoding its json columns
+
+    Args:
+        json_columns (list[str], optional): columns to json-decode. Defaults
+            to the ones recorded in the schema metadata.
+    """
+    if json_columns is None:
+        metadata = table.schema.metadata or {}
+        json_columns = json.loads(metadata.get(b'json_columns', b'[]'))
+    df = table.to_pandas()
+    for column in json_columns:
+        if column in df:
+            df[column] = df[column].map(
+                lambda v: v if pd.isnull(v) else json.loads(v))
+    return df
+
+
+def _from_arrow_tables(tables, json_columns=None):
+    try:
+        return _from_arrow_table(pa.concat_tables(tables), json_columns)
+    except pa.ArrowInvalid:
+        # partitions written at different times may disagree on inferred types
+        return pd.concat([_from_arrow_table(t, json_columns) for t in tables],
+                         ignore_index=True, sort=False)
+
+
+def _write_pipelines_partitions(df, cache_dir, json_columns, part=0):
+    """Write one Feather file per dataset
+
+    Args:
+        json_columns (list[str]): columns of the cache stored as json
+
+    Returns:
+        dict[str, str]: mapping of partition name to the file written to it
+    """
+    if df.empty:
+        return {}
+
+    keys = df['dataset'].map(_get_partition_name)
+    order = np.argsort(keys.values, kind='mergesort')
+    df = df.iloc[order]
+    keys = keys.iloc[order]
+
+    # convert once so that all partitions share a schema
+    table = _to_arrow_table(df, json_columns)
+    bounds = np.flatnonzero(keys.values[1:] != keys.values[:-1]) + 1
+    starts = np.concatenate([[0], bounds]).astype(int)
+    stops = np.concatenate([bounds, [len(keys)]]).astype(int)
+
+    files = {}
+    for start, stop in zip(starts, stops):
+        name = keys.iloc[start]
+        filename = f'part-{part:05d}.feather'
+        path = cache_dir.joinpath(name, filename)
         path.parent.mkdir(parents=True, exist_ok=True)
-        filters = _get_filters()
-        df = ex.get_pipelines(**filters)
-        df.to_pickle(path, compression='gzip')
+        feather.write_feather(table.slice(start, stop - start), str(path),
+                              compression='uncompressed')
+        files[name] = filename
+
+    return files
+
+
+def _get_watermark(df, watermark=None):
+    """Get the highest test_id in df and the latest ts seen for that test_id
+
+    Pipelines keep arriving for a test_id while its search is running, so the
+    ts is needed to tell apart the new pipelines of the newest cached test_id.
+    """
+    test_ids = df['test_id'].dropna()
+    if test_ids.empty:
+        return watermark
+
+    test_id = test_ids.max()
+    if watermark is not None and watermark['test_id'] > test_id:
+        return watermark
+
+    ts = pd.NaT
+    if 'ts' in df:
+        ts = pd.to_datetime(df.loc[df['test_id'] == test_id, 'ts']).max()
+    if (watermark is not None and watermark['test_id'] == test_id
+            and watermark['ts'] is not None):
+        ts = pd.Series([ts, pd.Timestamp(watermark['ts'])]).max()
+
+    return {
+        'test_id': test_id,
+        'ts': None if pd.isnull(ts) else pd.Timestamp(ts).isoformat(),
+    }
+
+
+def _write_pipelines_cache(df):
+    """Replace the pipelines cache with the contents of df"""
+    cache_dir = _get_pipelines_cache_dir()
+    tmp_dir = cache_dir.with_name(cache_dir.name + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    manifest = _get_empty_manifest()
+    _update_json_columns(manifest, df)
+    files = _write_pipelines_partitions(df, tmp_dir, manifest['json_columns'])
+    manifest.update({
+        'rows': len(df),
+        'columns': list(df.columns),
+        'partitions': {name: [filename] for name, filename in files.items()},
+        'next_part': 1,
+        'watermark': _get_watermark(df),
+    })
+    _write_manifest(tmp_dir, manifest)
+
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir)
+    tmp_dir.rename(cache_dir)
+
+
+def _get_empty_manifest():
+    return {
+        'version': PIPELINES_CACHE_FORMAT_VERSION,
+        'rows': 0,
+        'columns': [],
+        'json_columns': [],
+        'string_columns': [],
+        'partitions': {},
+        'next_part': 0,
+        'watermark': None,
+    }
+
+
+def _append_pipelines_cache(df, cache_dir=None):
+    """Append df to the pipelines cache as a delta partition
+
+    The columns of df are added to the cache even if it has no rows.
+    """
+    cache_dir = cache_dir or _get_pipelines_cache_dir()
+    manifest = _read_manifest(cache_dir)
+    manifest['columns'] += [
+        c for c in df.columns if c not in manifest['columns']]
+    if not df.empty:
+        _update_json_columns(manifest, df)
+        files = _write_pipelines_partitions(
+            df, cache_dir, manifest['json_columns'],
+            part=manifest['next_part'])
+        for name, filename in files.items():
+            manifest['partitions'].setdefault(name, []).append(filename)
+        manifest['next_part'] += 1
+        manifest['rows'] += len(df)
+        manifest['watermark'] = _get_watermark(df, manifest['watermark'])
+    _write_manifest(cache_dir, manifest)
+
+    return manifest
+
+
+def compact_pipelines_cache(max_parts=1, cache_dir=None):
+    """Merge the files of partitions that have more than max_parts files"""
+    cache_dir = cache_dir or _get_pipelines_cache_dir()
+    manifest = _read_manifest(cache_dir)
+
+    stale = []
+    for name, filenames in manifest['partitions'].items():
+        if len(filenames) <= max_parts:
+            continue
+        paths = [cache_dir.joinpath(name, f) for f in filenames]
+        df = _from_arrow_tables(
+            [feather.read_table(str(path), memory_map=True) for path in paths],
+            manifest['json_columns'])
+        filename = f'part-{manifest["next_part"]:05d}.feather'
+        feather.write_feather(_to_arrow_table(df, manifest['json_columns']),
+                              str(cache_dir.joinpath(name, filename)),
+                              compression='uncompressed')
+        manifest['partitions'][name] = [filename]
+        manifest['next_part'] += 1
+        stale.extend(paths)
+
+    # only remove the old files once the manifest no longer points to them
+    _write_manifest(cache_dir, manifest)
+    for path in stale:
+        path.unlink()
+
+
+# Pipelines are downloaded in batches of PIPELINES_BATCH_SIZE, each of which is
+# normalized and appended to the cache before the next one is fetched, so that
+# peak memory is bounded by the batch size rather than by the collection size.
+PIPELINES_BATCH_SIZE = 100000
+
+
+# the fields of the solutions that MongoPipelineExplorer.get_pipelines reads
+PIPELINES_PROJECTION = [
+    '_id', 'loader', 'dataset', 'metric', 'name', 'rank', 'score', 'template',
+    'test_id', 'pipeline', 'ts',
+]
+
+
+def _from_mongo_pipelines(records):
+    """Make a frame of solutions as MongoPipelineExplorer.get_pipelines does
+
+    The object ids are converted to strings, so that they can be cached.
+    """
+    df = pd.DataFrame.from_records(records, columns=PIPELINES_PROJECTION)
+    for column in ['_id', 'template']:
+        df[column] = df[column].map(
+            lambda v: v if pd.isnull(v) or isinstance(v, str) else str(v))
+    df['pipeline'] = df['name']
+
+    loader = df.pop('loader')
+    for key in ['data_modality', 'task_type']:
+        df[key] = loader.map(
+            lambda fields: (
+                fields.get(key) if isinstance(fields, dict) else None))
+
+    return df
+
+
+def _iter_pipelines(filters, batch_size=PIPELINES_BATCH_SIZE):
+    """Iterate over the pipelines matching filters in batches
+
+    From Mongo, the documents are read through a cursor, so that only one
+    batch is held in memory at a time. Other explorers return all of the
+    pipelines at once, which are then split into batches. At least one batch,
+    possibly empty, is yielded, so that the columns are known.
+    """
+    explorer = ex.get()
+    if isinstance(explorer, MongoPipelineExplorer):
+        cursor = explorer.db[PIPELINES_COLLECTION].find(
+            filters, projection=PIPELINES_PROJECTION, batch_size=batch_size)
+        batches = map(_from_mongo_pipelines, fy.chunks(batch_size, cursor))
+        empty = _from_mongo_pipelines([])
     else:
-        df = pd.read_pickle(path)
+        df = explorer.get_pipelines(**filters)
+        batches = (
+            df.iloc[start:start + batch_size]
+            for start in range(0, len(df), batch_size)
+        )
+        empty = df.iloc[:0]
 
-    _assert_filters(df)
+    n_batches = 0
+    for batch in batches:
+        n_batches += 1
+        yield batch
+    if not n_batches:
+        yield empty
 
+
+def _normalize_pipelines_batch(df):
+    """Give a batch of pipelines consistent dtypes and add their t-scores
+
+    Pipelines with an unknown metric get a missing t-score.
+    """
+    df = df.reset_index(drop=True)
+    if 'ts' in df:
+        df['ts'] = pd.to_datetime(df['ts'])
+    if 'score' in df:
+        df['score'] = pd.to_numeric(df['score'], errors='coerce').astype(float)
+    if 'score' in df and 'metric' in df:
+        known = df['metric'].isin(list(_METRIC_TYPES)).values
+        tscores = np.full(len(df), np.nan)
+        if known.any():
+            tscores[known] = (
+                _normalize_df(df[known], score_name='score').values)
+        df['t-score'] = tscores
     return df
 
 
-@fy.memoize
+def _ingest_pipelines(batches, cache_dir, skip=None,
+                      max_parts=PIPELINES_CACHE_MAX_PARTS):
+    """Normalize and append batches of pipelines to the cache in cache_dir
+
+    Args:
+        batches (Iterable[pd.DataFrame]): batches of pipelines
+        cache_dir (pathlib.Path): cache to append to
+        skip (callable, optional): gives a mask of the rows of a batch that
+            are already cached
+        max_parts (int): number of files a partition can have once all
+            batches are appended before it is compacted
+
+    Returns:
+        int: number of pipelines appended
+    """
+    n_rows = 0
+    with tqdm(desc='Caching pipelines', unit=' pipelines',
+              unit_scale=True) as progress:
+        for df in batches:
+            _assert_filters(df)
+            if skip is not None:
+                df = df.loc[~skip(df)]
+            df = _normalize_pipelines_batch(df)
+            _append_pipelines_cache(df, cache_dir=cache_dir)
+
+            n_rows += len(df)
+            progress.update(len(df))
+
+    compact_pipelines_cache(max_parts=max_parts, cache_dir=cache_dir)
+    return n_rows
+
+
+def sync_pipelines_cache():
+    """Fetch only the pipelines newer than the cache watermark
+
+    The watermark is the newest cached test_id and the latest ts cached for
+    it, so the pipelines of newer test runs and the new pipelines of the
+    newest one are fetched. Pipelines that arrive later for older test runs,
+    such as runs that were still searching concurrently with the newest one,
+    are not fetched; rebuild the cache with force_download to pick them up.
+    Without a cache, or a watermark, the whole cache is downloaded.
+
+    Returns:
+        int: number of new pipelines appended to the cache
+    """
+    cache_dir = _get_pipelines_cache_dir()
+    manifest = _read_manifest(cache_dir)
+    if manifest is None or manifest['watermark'] is None:
+        return _download_pipelines_cache()
+    watermark = manifest['watermark']
+
+    def seen(df):
+        # the pipelines of the newest cached test_id that were already cached
+        mask = df['test_id'] == watermark['test_id']
+        if watermark['ts'] is not None:
+            mask &= pd.to_datetime(df['ts']) <= pd.Timestamp(watermark['ts'])
+        return mask
+
+    filters = _get_filters(since=watermark['test_id'])
+    return _ingest_pipelines(_iter_pipelines(filters), cache_dir, skip=seen)
+
+
+@traced
+def _read_pipelines_cache(columns=None, datasets=None):
+    """Read the pipelines cache, memory-mapping only the requested columns
+
+    Args:
+        columns (Iterable[str], optional): columns to read. Defaults to all.
+        datasets (Iterable[str], optional): datasets to read. Defaults to all.
+    """
+    cache_dir = _get_pipelines_cache_dir()
+    manifest = _read_manifest(cache_dir)
+
+    partitions = manifest['partitions']
+    if datasets is not None:
+        names = {_get_partition_name(d) for d in datasets}
+        partitions = fy.project(partitions, names)
+
+    tables = []
+    for name in sorted(partitions):
+        for filename in partitions[name]:
+            path = str(cache_dir.joinpath(name, filename))
+            names = None
+            if columns is not None:
+                # delta files may predate columns added to the cache later
+                schema = pa.ipc.open_file(pa.memory_map(path)).schema
+                names = [c for c in schema.names if c in set(columns)]
+            tables.append(
+                feather.read_table(path, columns=names, memory_map=True))
+
+    if not tables:
+        return pd.DataFrame(columns=columns or manifest['columns'])
+
+    return _from_arrow_tables(tables, manifest['json_columns'])
+
+
+def convert_pipelines_cache(remove=False):
+    """Convert a legacy gzip-pickle pipelines cache to the columnar cache
+
+    Args:
+        remove (bool): whether to delete the legacy cache afterwards
+    """
+    path = _get_legacy_pipelines_cache_path()
+    df = pd.read_pickle(path)
+    _assert_filters(df)
+    _write_pipelines_cache(df)
+    if remove:
+        path.unlink()
+
+
+def _download_pipelines_cache():
+    """Download all pipelines and rebuild the cache, returning the row count
+
+    The pipelines are streamed into a new cache, which replaces the current
+    one once complete.
+    """
+    cache_dir = _get_pipelines_cache_dir()
+    tmp_dir = cache_dir.with_name(cache_dir.name + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    _write_manifest(tmp_dir, _get_empty_manifest())
+
+    n_rows = _ingest_pipelines(
+        _iter_pipelines(_get_filters()), tmp_dir, max_parts=1)
+
+    if cache_dir.exists():
+        shutil.rmtree(cache_dir)
+    tmp_dir.rename(cache_dir)
+    return n_rows
+
+
+@reads('cache/pipelines/_manifest.json')
+@memoize
+def _ensure_pipelines_cache(force_download=False, incremental=False):
+    """Build or update the pipelines cache, as needed, without reading it"""
+    cache_dir = _get_pipelines_cache_dir()
+    if force_download or _read_manifest(cache_dir) is None:
+        if not force_download and _get_legacy_pipelines_cache_path().exists():
+            convert_pipelines_cache()
+        else:
+            _download_pipelines_cache()
+    elif incremental:
+        sync_pipelines_cache()
+
+
+@memoize
+def _load_pipelines_df(force_download=False, columns=None, incremental=False):
+    """Get all pipelines, passing the analysis-specific test_id filter
+
+    Args:
+        force_download (bool): re-download pipelines and rebuild the cache
+        columns (tuple[str], optional): columns to load, in addition to
+            ``test_id``, which is always loaded to check the filters. Defaults
+            to all columns.
+        incremental (bool): fetch pipelines newer than the ones already cached
+            and append them to the cache
+    """
+    _ensure_pipelines_cache(
+        force_download=force_download, incremental=incremental)
+
+    if columns is not None:
+        columns = tuple(columns) + ('test_id',)
+    df = _read_pipelines_cache(columns=columns)
+
+    _assert_filters(df)
+
+    return _compact_df(df, name='pipelines')
+
+
+@reads('baselines.tsv')
+@memoize
 def _load_baselines_df():
     df = pd.read_table(DATA_DIR.joinpath('baselines.tsv'))
     df['problem'] = df['problem'].str.replace('_problem', '')
@@ -154,9 +1340,254 @@ def _load_baselines_df():
     return df
 
 
-def _get_best_pipeline(problem):
-    filters = _get_filters()
-    return ex.get_best_pipeline(problem, **filters)
+def _get_best_pipelines_cache_path():
+    return DATA_DIR.joinpath('cache', 'best_pipelines.feather')
+
+
+def _find_best_pipelines(datasets):
+    """Find the pipeline with the lowest rank of each dataset, in one pass
+
+    As in ``get_best_pipeline`` of the piex explorers, the best pipeline is
+    the one with the lowest ``rank``. Only the cache partitions of the given
+    datasets are read.
+    """
+    df = _read_pipelines_cache(datasets=datasets)
+    df = df.dropna(subset=['dataset'])
+    if df.empty:
+        return df
+
+    ranks = pd.to_numeric(df['rank'], errors='coerce')
+    order = np.argsort(ranks.values, kind='mergesort')
+    return (
+        df.iloc[order]
+        [ranks.iloc[order].notnull().values]
+        .drop_duplicates(subset=['dataset'])
+        .reset_index(drop=True)
+    )
+
+
+# bump when the selection of the best pipelines changes, so that they are
+# looked up again
+BEST_PIPELINES_CACHE_VERSION = 2
+
+
+def _get_best_pipelines(problems):
+    """Get the best pipeline of each problem, in one lookup
+
+    As in ``get_best_pipeline`` of the piex explorers, the pipelines of a
+    problem are those of either the problem itself or its dataset_id. The best
+    pipelines are cached next to the pipelines cache, and are looked up again
+    only for new problems or once the pipelines cache has been updated.
+
+    Returns:
+        pd.DataFrame: one row per problem that has any pipelines, with the
+            problem in the ``problem`` column
+    """
+    datasets_df = _get_datasets_df()
+    dataset_ids = dict(zip(datasets_df['dataset'], datasets_df['dataset_id']))
+    candidates = pd.DataFrame(
+        [(problem, problem) for problem in problems]
+        + [
+            (problem, dataset_ids[problem]) for problem in problems
+            if pd.notnull(dataset_ids.get(problem))
+            and dataset_ids[problem] != problem
+        ],
+        columns=['problem', 'dataset'])
+    datasets = list(candidates['dataset'].unique())
+
+    _ensure_pipelines_cache()
+    watermark = json.dumps(
+        _read_manifest(_get_pipelines_cache_dir())['watermark'])
+
+    path = _get_best_pipelines_cache_path()
+    cached = pd.DataFrame(columns=['dataset', 'rank'])
+    searched = []
+    if path.exists():
+        table = feather.read_table(str(path))
+        metadata = table.schema.metadata
+        version = int(metadata.get(b'version', b'1'))
+        if (version == BEST_PIPELINES_CACHE_VERSION
+                and metadata.get(b'watermark', b'').decode() == watermark):
+            cached = _from_arrow_table(table)
+            searched = json.loads(metadata[b'datasets'])
+
+    missing = [d for d in datasets if d not in searched]
+    if missing:
+        found = _find_best_pipelines(missing)
+        if cached.empty:
+            cached = found
+        else:
+            cached = pd.concat([cached, found], ignore_index=True, sort=False)
+        searched = searched + missing
+
+        table = _to_arrow_table(cached)
+        metadata = dict(table.schema.metadata)
+        metadata[b'version'] = str(BEST_PIPELINES_CACHE_VERSION).encode()
+        metadata[b'watermark'] = watermark.encode()
+        metadata[b'datasets'] = json.dumps(searched).encode()
+        feather.write_feather(table.replace_schema_metadata(metadata),
+                              str(path), compression='uncompressed')
+
+    # the best pipeline of a problem is the best of its datasets
+    df = candidates.merge(cached, on='dataset', how='inner')
+    ranks = pd.to_numeric(df['rank'], errors='coerce')
+    order = np.argsort(ranks.values, kind='mergesort')
+    return (
+        df.iloc[order]
+        .drop_duplicates(subset=['problem'])
+        .reset_index(drop=True)
+    )
+
+
+# A snapshot holds the data that the explorer serves in local files, so that
+# the analysis can run without network access. The pipelines and test results
+# are sorted by test_id, so that a test_id filter selects a contiguous slice
+# of the memory-mapped file and only the matching rows are converted, and the
+# best pipeline of each dataset is precomputed.
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def _get_snapshot_dir():
+    return DATA_DIR.joinpath('snapshot')
+
+
+def _write_snapshot_table(df, path):
+    if 'test_id' in df:
+        df = df.sort_values('test_id', kind='mergesort')
+    feather.write_feather(_to_arrow_table(df), str(path),
+                          compression='uncompressed')
+
+
+def create_snapshot(path=None):
+    """Snapshot the data served by the explorer to local files
+
+    Args:
+        path (path-like, optional): directory to write the snapshot to.
+            Defaults to DATA_DIR/snapshot.
+    """
+    path = pathlib.Path(path or _get_snapshot_dir())
+    tmp_path = path.with_name(path.name + '.tmp')
+    shutil.rmtree(str(tmp_path), ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    _ensure_pipelines_cache()
+    _write_snapshot_table(
+        _read_pipelines_cache(), tmp_path.joinpath('pipelines.feather'))
+    _write_snapshot_table(
+        _find_best_pipelines(None),
+        tmp_path.joinpath('best_pipelines.feather'))
+    _write_snapshot_table(
+        ex.get_test_results(**_get_filters()),
+        tmp_path.joinpath('test_results.feather'))
+    _write_snapshot_table(
+        _get_datasets_df(), tmp_path.joinpath('datasets.feather'))
+
+    with tmp_path.joinpath('_manifest.json').open('w') as f:
+        json.dump({
+            'version': SNAPSHOT_FORMAT_VERSION,
+            'created': time.time(),
+            'test_id_start': TEST_ID_START,
+        }, f, indent=2)
+
+    if path.exists():
+        shutil.rmtree(str(path))
+    os.replace(str(tmp_path), str(path))
+
+
+class LocalPipelineExplorer:
+    """Explorer serving a snapshot from local files
+
+    It has the methods of the piex explorers that the analysis uses, and
+    supports filters on test_id only.
+    """
+
+    def __init__(self, path=None):
+        self.path = pathlib.Path(path or _get_snapshot_dir())
+        if not self.path.joinpath('_manifest.json').exists():
+            raise FileNotFoundError(
+                'No snapshot found at {}'.format(self.path))
+        self._dataset_ids = None
+        self._best_pipelines = None
+
+    @staticmethod
+    def _slice_test_ids(table, filters):
+        """Slice the rows of table, sorted by test_id, matching filters"""
+        unknown = set(filters) - {'test_id'}
+        if unknown:
+            raise ValueError(
+                'Cannot filter the snapshot on {}'.format(', '.join(unknown)))
+
+        column = table.column('test_id')
+        # missing test_ids are sorted last and never match
+        n_valid = len(column) - column.null_count
+        test_ids = column.to_pandas().values[:n_valid]
+
+        condition = filters['test_id']
+        if not isinstance(condition, dict):
+            condition = {'$gte': condition, '$lte': condition}
+        start, stop = 0, n_valid
+        for op, value in condition.items():
+            if op == '$gte':
+                start = max(start, np.searchsorted(test_ids, value, 'left'))
+            elif op == '$gt':
+                start = max(start, np.searchsorted(test_ids, value, 'right'))
+            elif op == '$lte':
+                stop = min(stop, np.searchsorted(test_ids, value, 'right'))
+            elif op == '$lt':
+                stop = min(stop, np.searchsorted(test_ids, value, 'left'))
+            else:
+                raise ValueError('Unsupported operator: {}'.format(op))
+
+        return table.slice(int(start), int(max(stop - start, 0)))
+
+    def _read(self, name, filters=None):
+        path = str(self.path.joinpath(name + '.feather'))
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        if filters:
+            table = self._slice_test_ids(table, filters)
+        return _from_arrow_table(table)
+
+    def get_pipelines(self, **filters):
+        return self._read('pipelines', filters)
+
+    def get_test_results(self, **filters):
+        return self._read('test_results', filters)
+
+    def get_datasets(self):
+        return self._read('datasets')
+
+    def _get_dataset_ids(self):
+        if self._dataset_ids is None:
+            self._dataset_ids = (
+                self.get_datasets()
+                .set_index('dataset')
+                ['dataset_id']
+                .to_dict()
+            )
+        return self._dataset_ids
+
+    def get_dataset_id(self, dataset):
+        return self._get_dataset_ids()[dataset]
+
+    def get_best_pipeline(self, dataset, **filters):
+        """Get the best pipeline of dataset, or None if it has none
+
+        As in the piex explorers, the pipelines of either the dataset or its
+        dataset_id are matched, and the one with the lowest rank is returned.
+        """
+        if filters:
+            pipelines = self.get_pipelines(**filters)
+        else:
+            if self._best_pipelines is None:
+                self._best_pipelines = self._read('best_pipelines')
+            pipelines = self._best_pipelines
+
+        datasets = [dataset, self._get_dataset_ids().get(dataset, dataset)]
+        df = pipelines[pipelines['dataset'].isin(datasets)]
+        ranks = pd.to_numeric(df['rank'], errors='coerce').dropna()
+        if ranks.empty:
+            return None
+        return df.loc[ranks.idxmin()].rename({'_id': 'id'})
 
 
 def get_disk_usage_compressed(dataset_id):
@@ -164,20 +1595,108 @@ def get_disk_usage_compressed(dataset_id):
     return os.path.getsize(path)
 
 
-def get_disk_usage_inflated(dataset_id):
-    start_path = os.path.join(DATA_DIR, dataset_id)
+def _get_tree_size(start_path):
+    """Sum the sizes of the regular files under start_path, skipping links"""
     total_size = 0
-    for dirpath, _, filenames in os.walk(start_path):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            # skip if it is symbolic link
-            if not os.path.islink(fp):
-                total_size += os.path.getsize(fp)
+    stack = [start_path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    total_size += entry.stat().st_size
+    return total_size
+
 
+def _get_tar_size(path):
+    """Sum the sizes of the regular files in a tarball from its headers
+
+    The archive is still decompressed to get from one header to the next, but
+    nothing is extracted and the file contents are skipped.
+    """
+    total_size = 0
+    with tarfile.open(path, 'r:gz') as tar:
+        for member in tar:
+            if member.isfile():
+                total_size += member.size
+            elif member.islnk():
+                # hard links are counted at the size of their target
+                total_size += tar.getmember(member.linkname).size
     return total_size
 
 
-class jsoncached:
+def get_disk_usage_inflated(dataset_id, method='auto'):
+    """Get the size of the dataset once extracted
+
+    Args:
+        method (str): 'walk' to walk the extracted directory, 'tar' to read
+            the headers of the tarball, or 'auto' to walk the directory if it
+            has been extracted and read the tarball otherwise
+    """
+    start_path = os.path.join(DATA_DIR, dataset_id)
+    if method == 'auto':
+        method = 'walk' if os.path.isdir(start_path) else 'tar'
+
+    if method == 'walk':
+        return _get_tree_size(start_path)
+    elif method == 'tar':
+        return _get_tar_size(os.path.join(DATA_DIR, f'{dataset_id}.tar.gz'))
+    else:
+        raise ValueError(f'Unknown method: {method}')
+
+
+class _recordcached:
+    """Decorator caching the record computed for each dataset_id
+
+    requested_fields maps keyword arguments of the function to the record
+    field that they request. A cached record is recomputed when one of these
+    arguments is set but the record lacks its field, e.g. a record created
+    without measure_size, when it is then called with measure_size=True.
+    """
+
+    requested_fields = {}
+
+    def has_requested_fields(self, record, kwargs):
+        """Whether record has the fields requested by kwargs"""
+        return all(
+            record.get(field) is not None
+            for kwarg, field in self.requested_fields.items()
+            if kwargs.get(kwarg)
+        )
+
+    def save_records(self, records):
+        for record in records:
+            self.save_record(record['dataset_id'], record)
+
+    def load_records(self, dataset_ids):
+        """Load the cached records among dataset_ids, keyed by dataset_id"""
+        return {
+            dataset_id: self.load_record(dataset_id)
+            for dataset_id in dataset_ids
+            if self.exists_record(dataset_id)
+        }
+
+    def __call__(self, func):
+
+        @fy.wraps(func)
+        def wrapped(dataset_id, **kwargs):
+            if self.exists_record(dataset_id):
+                record = self.load_record(dataset_id)
+                if self.has_requested_fields(record, kwargs):
+                    return record
+
+            record = func(dataset_id, **kwargs)
+            self.save_record(dataset_id, record)
+            return record
+
+        wrapped.cache = self
+        return wrapped
+
+
+class jsoncached(_recordcached):
 
     def __init__(self, cache_dir):
         self.cache_dir = cache_dir
@@ -200,33 +1719,279 @@ class jsoncached:
         path = self.get_record_path(dataset_id)
         return os.path.exists(path)
 
-    def __call__(self, func):
 
-        @fy.wraps(func)
-        def wrapped(dataset_id):
-            if self.exists_record(dataset_id):
-                return self.load_record(dataset_id)
+class sqlitecached(_recordcached):
+    """Record cache backed by a single SQLite file, keyed by dataset_id
+
+    Each record is stored with the version of the code that created it.
+    Records of another version, or that were invalidated, are recomputed on
+    the next call. The database is opened in WAL mode so that several
+    processes can read while one writes.
+    """
+
+    def __init__(self, path, version=1, requested_fields=None):
+        self.path = pathlib.Path(path)
+        self.version = version
+        if requested_fields is not None:
+            self.requested_fields = requested_fields
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=60)
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS records ('
+                '    dataset_id TEXT PRIMARY KEY,'
+                '    version INTEGER NOT NULL,'
+                '    stale INTEGER NOT NULL DEFAULT 0,'
+                '    created TEXT NOT NULL,'
+                '    record TEXT NOT NULL'
+                ')')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def save_records(self, records):
+        created = pd.Timestamp.now().isoformat()
+        rows = [
+            (record['dataset_id'], self.version, created, json.dumps(record))
+            for record in records
+        ]
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO records '
+                '(dataset_id, version, stale, created, record) '
+                'VALUES (?, ?, 0, ?, ?)', rows)
+
+    def save_record(self, dataset_id, record):
+        self.save_records([dict(record, dataset_id=dataset_id)])
+
+    def _select(self, dataset_ids=None):
+        query = 'SELECT record FROM records WHERE version = ? AND stale = 0'
+        params = [self.version]
+        with contextlib.closing(self._connect()) as conn:
+            if dataset_ids is None:
+                return conn.execute(query, params).fetchall()
+            rows = []
+            # stay under the default limit of 999 host parameters
+            for chunk in fy.chunks(500, list(dataset_ids)):
+                rows.extend(conn.execute(
+                    query + ' AND dataset_id IN ({})'.format(
+                        ', '.join('?' * len(chunk))),
+                    params + chunk).fetchall())
+            return rows
+
+    def load_records(self, dataset_ids):
+        records = (json.loads(record) for record, in self._select(dataset_ids))
+        return {record['dataset_id']: record for record in records}
+
+    def load_record(self, dataset_id):
+        return self.load_records([dataset_id])[dataset_id]
+
+    def exists_record(self, dataset_id):
+        return bool(self._select([dataset_id]))
+
+    def load_dataframe(self, dataset_ids=None):
+        """Load the current records into a DataFrame, one row per dataset"""
+        return pd.DataFrame.from_records(
+            [json.loads(record) for record, in self._select(dataset_ids)])
+
+    def invalidate(self, dataset_ids=None):
+        """Mark records as stale so that they are recomputed on next use"""
+        with contextlib.closing(self._connect()) as conn, conn:
+            if dataset_ids is None:
+                conn.execute('UPDATE records SET stale = 1')
             else:
-                record = func(dataset_id)
-                self.save_record(dataset_id, record)
-                return record
+                conn.executemany(
+                    'UPDATE records SET stale = 1 WHERE dataset_id = ?',
+                    [(dataset_id,) for dataset_id in dataset_ids])
 
-        return wrapped
+    def import_records(self, cache_dir):
+        """Copy the records of a jsoncached cache that are not yet stored
 
+        Args:
+            cache_dir (pathlib.Path): directory of the jsoncached cache, which
+                is left alone if it does not exist
+        """
+        if not cache_dir.is_dir():
+            return
+        other = jsoncached(cache_dir)
+        dataset_ids = [p.stem for p in cache_dir.glob('*.json')]
+        present = self.load_records(dataset_ids)
+        self.save_records([
+            other.load_record(dataset_id)
+            for dataset_id in dataset_ids
+            if dataset_id not in present
+        ])
+
+
+STATS_CHUNKSIZE = 100000
+
+
+class HyperLogLog:
+    """Approximate distinct counter over 64-bit hashes
+
+    With the default precision of 14, the standard error is about 0.8% and the
+    registers take 16 KiB regardless of the number of distinct values.
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # rank is the position of the leftmost 1-bit in the remaining bits
+        with np.errstate(divide='ignore'):
+            msb = np.floor(np.log2(rest.astype(np.float64)))
+        rank = np.where(rest == 0, 64 - p + 1, (64 - p) - msb).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        harmonic_sum = np.sum(2.0 ** -self.registers.astype(float))
+        estimate = alpha * m ** 2 / harmonic_sum
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class _ExactDistinct:
+    """Exact distinct counter over 64-bit hashes, kept as a sorted array"""
+
+    def __init__(self):
+        self.hashes = np.array([], dtype=np.uint64)
+
+    def update(self, hashes):
+        self.hashes = np.union1d(self.hashes, hashes)
+
+    def count(self):
+        return len(self.hashes)
+
+
+_DISTINCT_COUNTERS = {
+    'exact': _ExactDistinct,
+    'hll': HyperLogLog,
+}
+
+
+def _get_train_dir(dataset_id):
+    return os.path.join(DATA_DIR, dataset_id, 'TRAIN')
+
+
+def _get_target_names(dataset_id):
+    path = os.path.join(
+        _get_train_dir(dataset_id), 'problem_TRAIN', 'problemDoc.json')
+    with open(path, 'r') as f:
+        problem_doc = json.load(f)
+    return [
+        target['colName']
+        for data in problem_doc['inputs']['data']
+        for target in data['targets']
+    ]
 
-@jsoncached(DATA_DIR.joinpath('cache', 'records'))
-def create_record(dataset_id):
-    # in-memory
-    dataset = mit_d3m.load_dataset(dataset_id)
-    if dataset is None:
-        raise RuntimeError(f'Failed to process dataset {dataset_id}')
 
-    size = getsize(dataset)
-    n = len(dataset.y)
-    m = dataset.X.shape[1]
-    classes = len(np.unique(dataset.y))
+def _get_learning_data_path(dataset_id):
+    """Get the path of learningData.csv if it is the only resource, else None
 
-    del dataset
+    Datasets with other resources (images, audio, other tables) are joined
+    and featurized when they are loaded, so their shape cannot be read off
+    learningData.csv.
+    """
+    dataset_dir = os.path.join(_get_train_dir(dataset_id), 'dataset_TRAIN')
+    path = os.path.join(dataset_dir, 'datasetDoc.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        dataset_doc = json.load(f)
+
+    resources = dataset_doc['dataResources']
+    if len(resources) != 1:
+        return None
+    return os.path.join(dataset_dir, resources[0]['resPath'])
+
+
+def _stream_dataset_stats(dataset_id, classes_method='exact',
+                          chunksize=STATS_CHUNKSIZE):
+    """Compute n, m and classes reading learningData.csv in chunks
+
+    Only the target column is parsed, and the distinct targets are counted
+    from their hashes, exactly or with a HyperLogLog, so memory does not grow
+    with the number of examples.
+
+    Returns:
+        dict: n, m and classes, or None if the dataset is not a single table
+    """
+    path = _get_learning_data_path(dataset_id)
+    if path is None:
+        return None
+
+    targets = _get_target_names(dataset_id)
+    columns = pd.read_csv(path, nrows=0).columns
+    counter = _DISTINCT_COUNTERS[classes_method]()
+
+    n = 0
+    for chunk in pd.read_csv(path, usecols=targets[:1], dtype=str,
+                             chunksize=chunksize):
+        y = chunk[targets[0]]
+        n += len(y)
+        counter.update(pd.util.hash_array(y.values))
+
+    return {
+        'n': n,
+        'm': len(columns) - len(targets),
+        'classes': counter.count(),
+    }
+
+
+# bump when the contents of the records change, so that they are recomputed
+RECORD_VERSION = 1
+
+
+@sqlitecached(DATA_DIR.joinpath('cache', 'records.sqlite'),
+              version=RECORD_VERSION,
+              requested_fields={'measure_size': 'size'})
+def create_record(dataset_id, measure_size=False, classes_method='exact'):
+    """Create the task characteristics record of a dataset
+
+    The shape and number of classes are streamed from disk when possible. The
+    dataset is only loaded into memory if measure_size is set, or if it is not
+    a single table.
+
+    Args:
+        measure_size (bool): measure the in-memory size of the dataset
+        classes_method (str): how to count distinct targets when streaming,
+            one of 'exact' or 'hll'
+    """
+    stats = None
+    if not measure_size:
+        stats = _stream_dataset_stats(
+            dataset_id, classes_method=classes_method)
+
+    # in-memory
+    size = None
+    if stats is None:
+        dataset = mit_d3m.load_dataset(dataset_id)
+        if dataset is None:
+            raise RuntimeError(f'Failed to process dataset {dataset_id}')
+
+        if measure_size:
+            size = getsize(dataset)
+        stats = {
+            'n': len(dataset.y),
+            'm': dataset.X.shape[1],
+            'classes': len(np.unique(dataset.y)),
+        }
+
+        del dataset
 
     # on-disk
     du_compressed = get_disk_usage_compressed(dataset_id)
@@ -235,9 +2000,9 @@ def create_record(dataset_id):
     record = {
         'dataset_id': dataset_id,
         'size': size,
-        'n': n,
-        'm': m,
-        'classes': classes,
+        'n': stats['n'],
+        'm': stats['m'],
+        'classes': stats['classes'],
         'du_compressed': du_compressed,
         'du_inflated': du_inflated,
     }
@@ -245,28 +2010,247 @@ def create_record(dataset_id):
     return record
 
 
+BIG_DATASETS = ['124_153_svhn_cropped', '31_urbansound',
+                'bone_image_classification', 'bone_image_collection']
+
+
+def _get_records_error_log_path():
+    return DATA_DIR.joinpath('cache', 'records_errors.jsonl')
+
+
+def _log_record_error(dataset_id, error, message, elapsed, tb=None):
+    path = _get_records_error_log_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        'dataset_id': dataset_id,
+        'error': error,
+        'message': message,
+        'elapsed': elapsed,
+        'traceback': tb,
+        'time': pd.Timestamp.now().isoformat(),
+    }
+    with path.open('a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+
+def _get_dataset_schedule(dataset_id_list):
+    """Order datasets so that the biggest ones are started first"""
+    def key(dataset_id):
+        path = os.path.join(DATA_DIR, f'{dataset_id}.tar.gz')
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        return dataset_id not in BIG_DATASETS, -size
+
+    return sorted(dataset_id_list, key=key)
+
+
+def _create_record_worker(dataset_id, kwargs, memory_limit, conn):
+    if memory_limit is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    try:
+        record = create_record.__wrapped__(dataset_id, **kwargs)
+    except BaseException as e:
+        conn.send(('error', type(e).__name__, str(e), traceback.format_exc()))
+    else:
+        conn.send(('ok', record))
+    finally:
+        conn.close()
+
+
+def _create_records_parallel(dataset_id_list, kwargs, n_jobs, timeout,
+                             memory_limit):
+    """Create records in worker processes, yielding each one as it completes
+
+    Each dataset runs in its own process so that it can be killed once it
+    exceeds the timeout, and so that a crash or memory cap only takes down
+    that dataset. Each record is saved by this process as soon as it
+    completes, so an interrupted run loses no finished records.
+    """
+    cache = create_record.cache
+    pending = deque(dataset_id_list)
+    running = {}
+    with tqdm(total=len(dataset_id_list)) as progress:
+        while pending or running:
+            while pending and len(running) < n_jobs:
+                dataset_id = pending.popleft()
+                recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_create_record_worker,
+                    args=(dataset_id, kwargs, memory_limit, send_conn),
+                    daemon=True)
+                process.start()
+                send_conn.close()
+                running[recv_conn] = (dataset_id, process, time.time())
+
+            ready = multiprocessing.connection.wait(list(running), timeout=1)
+            for conn in list(running):
+                dataset_id, process, started = running[conn]
+                elapsed = time.time() - started
+                if conn in ready:
+                    try:
+                        result = conn.recv()
+                    except EOFError:
+                        result = ('error', 'WorkerDied',
+                                  f'exit code {process.exitcode}', None)
+                elif timeout is not None and elapsed > timeout:
+                    process.terminate()
+                    result = ('error', 'Timeout',
+                              f'exceeded {timeout} seconds', None)
+                else:
+                    continue
+
+                del running[conn]
+                conn.close()
+                process.join()
+                progress.update()
+
+                if result[0] == 'ok':
+                    record = result[1]
+                    cache.save_record(dataset_id, record)
+                    yield record
+                else:
+                    _, error, message, tb = result
+                    _log_record_error(dataset_id, error, message, elapsed, tb)
+
+
 @fy.collecting
-def create_all_records(process_big=True):
-    dataset_id_list = ex.get_datasets()['dataset'].tolist()
-    biglist = ['124_153_svhn_cropped', '31_urbansound',
-               'bone_image_classification', 'bone_image_collection']
+def create_all_records(process_big=True, n_jobs=1, timeout=None,
+                       memory_limit=None, measure_size=False,
+                       classes_method='exact'):
+    """Create the task characteristics record of every dataset
+
+    Records already in the cache are reused, so an interrupted run resumes
+    where it stopped, except that records without a size are recomputed when
+    measure_size is set. Datasets that fail are logged to
+    ``data/cache/records_errors.jsonl`` and skipped.
+
+    Args:
+        process_big (bool): whether to process the datasets in BIG_DATASETS
+        n_jobs (int): number of datasets to process in parallel
+        timeout (float, optional): seconds after which a dataset is killed
+        memory_limit (int, optional): bytes of address space per dataset
+        measure_size (bool): measure the in-memory size of each dataset
+        classes_method (str): how to count distinct targets, one of 'exact'
+            or 'hll'
+    """
+    dataset_id_list = _get_datasets_df()['dataset'].tolist()
     if not process_big:
-        dataset_id_list = [l for l in dataset_id_list if l not in biglist]
+        dataset_id_list = [
+            l for l in dataset_id_list if l not in BIG_DATASETS]
+
+    cache = create_record.cache
+    cache.import_records(DATA_DIR.joinpath('cache', 'records'))
 
-    for dataset_id in tqdm(dataset_id_list):
-        with fy.suppress(Exception):
-            yield create_record(dataset_id)
+    kwargs = {'measure_size': measure_size, 'classes_method': classes_method}
+    records = {
+        dataset_id: record
+        for dataset_id, record in cache.load_records(dataset_id_list).items()
+        if cache.has_requested_fields(record, kwargs)
+    }
+    yield from records.values()
+    todo = _get_dataset_schedule([
+        dataset_id for dataset_id in dataset_id_list
+        if dataset_id not in records
+    ])
+
+    if n_jobs > 1 or timeout is not None or memory_limit is not None:
+        yield from _create_records_parallel(
+            todo, kwargs, n_jobs, timeout, memory_limit)
+        return
+
+    for dataset_id in tqdm(todo):
+        started = time.time()
+        try:
+            yield create_record(dataset_id, **kwargs)
+        except Exception as e:
+            _log_record_error(dataset_id, type(e).__name__, str(e),
+                              time.time() - started, traceback.format_exc())
 
 
 # ------------------------------------------------------------------------------
 # Saving results
 # ------------------------------------------------------------------------------
 
+FIGURE_FORMATS = ('png', 'pdf', 'eps')
+
+_savefig_options = {
+    'formats': FIGURE_FORMATS,
+    'dpi': None,  # defaults to savefig.dpi
+}
+
+# the pool rendering the formats of figures, shared by all figures, and
+# whether to use it, which main disables when targets run in parallel
+_savefig_pool = {
+    'parallel': True,
+    'executor': None,
+    'pid': None,
+}
+
+
+def _configure_savefig(formats=None, dpi=None, parallel=None):
+    if formats is not None:
+        _savefig_options['formats'] = tuple(formats)
+    if dpi is not None:
+        _savefig_options['dpi'] = dpi
+    if parallel is not None:
+        _savefig_pool['parallel'] = parallel
+
+
+def _get_savefig_dpi(fig):
+    dpi = _savefig_options['dpi'] or matplotlib.rcParams['savefig.dpi']
+    return fig.dpi if dpi == 'figure' else dpi
+
+
+def _get_savefig_executor():
+    """Get the pool rendering figures, created on first use in each process"""
+    if (_savefig_pool['executor'] is None
+            or _savefig_pool['pid'] != os.getpid()):
+        _savefig_pool['executor'] = concurrent.futures.ProcessPoolExecutor(
+            len(_savefig_options['formats']))
+        _savefig_pool['pid'] = os.getpid()
+    return _savefig_pool['executor']
+
+
+def _render_figure(fig, path, dpi):
+    if isinstance(fig, bytes):
+        fig = pickle.loads(fig)
+    fig.savefig(str(path), bbox_inches='tight', pad_inches=0, dpi=dpi)
+
+
+@traced
 def _savefig(fig, name, figdir=OUTPUT_DIR):
+    """Save fig in each of the configured formats
+
+    Each format computes its own tight bounding box, as the backends measure
+    text differently. The formats are rendered concurrently from a pickled
+    copy of fig by a pool of worker processes shared by all figures, unless
+    the targets already run in parallel, in which case they are rendered one
+    at a time.
+    """
     figdir = pathlib.Path(figdir)
-    for ext in ['.png', '.pdf', '.eps']:
-        fig.savefig(figdir.joinpath(name+ext),
-                    bbox_inches='tight', pad_inches=0)
+    dpi = _get_savefig_dpi(fig)
+    paths = [
+        figdir.joinpath('{}.{}'.format(name, fmt))
+        for fmt in _savefig_options['formats']
+    ]
+
+    if len(paths) > 1 and _savefig_pool['parallel']:
+        try:
+            data = pickle.dumps(fig)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            data = None
+        if data is not None:
+            executor = _get_savefig_executor()
+            futures = [
+                executor.submit(_render_figure, data, path, dpi)
+                for path in paths
+            ]
+            for future in futures:
+                future.result()
+            return
+
+    for path in paths:
+        _render_figure(fig, path, dpi)
+
 
 # ------------------------------------------------------------------------------
 # Preprocessing
@@ -304,68 +2288,241 @@ def _make_normalizer(metric_type, min=None, max=None):
 
 
 def _normalize_df(df, score_name='cv_score'):
-    normalize = _make_normalizer(_METRIC_TYPES[df['metric']])
-    return normalize(df[score_name])
+    """Normalize the scores of each row according to the type of its metric
+
+    The rows are grouped by metric type and each normalizer is applied once to
+    the scores of its group, giving the same values as applying it row by row.
+    """
+    metric_types = df['metric'].map(_METRIC_TYPES)
+    unknown = df['metric'][metric_types.isnull()]
+    if not unknown.empty:
+        raise KeyError(unknown.iloc[0])
+
+    scores = df[score_name].values
+    normalized = np.empty(len(df), dtype=float)
+    for metric_type, idx in metric_types.groupby(metric_types).indices.items():
+        normalize = _make_normalizer(metric_type)
+        normalized[idx] = normalize(np.asarray(scores[idx], dtype=float))
+
+    return pd.Series(normalized, index=df.index)
 
 
+@traced
 def _add_tscores(df, score_name='score'):
     if 't-score' not in df:
-        df['t-score'] = df.apply(_normalize_df, score_name=score_name, axis=1)
+        df['t-score'] = _normalize_df(df, score_name=score_name)
+        return
 
+    # rows cached before t-scores were cached have none
+    missing = df['t-score'].isnull()
+    if missing.any():
+        df.loc[missing, 't-score'] = _normalize_df(
+            df[missing], score_name=score_name)
 
-@fy.memoize
-def _get_tuning_results_df():
-    df = _load_pipelines_df()
 
-    def default_score(group):
-        return group.sort_values(by='ts', ascending=True)['score'].iloc[0]
+# number of set bits of each byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
 
-    def min_max_score(group):
-        return group['score'].agg(['min', 'max'])
+class TagIndex:
+    """Inverted index from tags to bitmaps of the rows whose value has the tag
+
+    A tag, such as a primitive name or a tuner type, is a substring of the
+    indexed column. Its bitmap is computed on first use by matching the tag
+    against the distinct values of the column only, and is packed to one bit
+    per row, so that combining tags is a bitwise operation over a few bytes
+    per row instead of another scan of the strings.
+    """
+
+    def __init__(self, values):
+        values = pd.Series(values).astype('category')
+        self.n_rows = len(values)
+        self._categories = pd.Series(values.cat.categories)
+        self._codes = values.cat.codes.values
+        self._bitmaps = {}
+
+    def __getitem__(self, tag):
+        if tag not in self._bitmaps:
+            matches = (
+                self._categories
+                .str
+                .contains(tag, regex=False)
+                .fillna(False)
+                .values
+                .astype(bool)
+            )
+            # missing values have code -1, which picks the appended False
+            matches = np.append(matches, False)
+            self._bitmaps[tag] = np.packbits(matches[self._codes])
+        return self._bitmaps[tag]
+
+    def bitmap(self, *tags):
+        """Get the bitmap of the rows that have all of the tags"""
+        return np.bitwise_and.reduce([self[tag] for tag in tags])
+
+    def mask(self, *tags):
+        """Get a boolean mask of the rows that have all of the tags"""
+        bits = np.unpackbits(self.bitmap(*tags))[:self.n_rows]
+        return bits.astype(bool)
+
+    def count(self, *tags):
+        """Count the rows that have all of the tags"""
+        return int(_POPCOUNT[self.bitmap(*tags)].sum())
+
+
+@memoize
+def _get_pipelines_tag_index(column='pipeline'):
+    df = _load_pipelines_df(columns=(column,))
+    return TagIndex(df[column])
+
+
+@memoize
+def _get_test_results_tag_index(column):
+    return TagIndex(_get_test_results_df()[column])
+
+
+BOOTSTRAP_SAMPLES = 10000
+
+
+@traced
+def _head_to_head(scores, n_samples=BOOTSTRAP_SAMPLES, confidence=0.95,
+                  random_state=0):
+    """Compare contenders by the datasets on which each has the best score
+
+    The winner of a dataset is the first contender with the best score, and
+    the dataset is a tie if other contenders have the same score. The win
+    rates are bootstrapped over datasets, drawing the number of times each
+    dataset is resampled for all samples at once, so that the wins of all
+    samples are a single matrix product.
+
+    Args:
+        scores (pd.DataFrame): one row per dataset and one column per
+            contender, without missing values
+        n_samples (int): number of bootstrap samples
+        confidence (float): confidence level of the intervals
+        random_state (int): seed of the bootstrap samples
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: per contender, the wins, ties,
+            percent of datasets won and the bounds of its confidence interval;
+            and per dataset, the winner, whether it is a tie and the margin of
+            the best score over the next best one
+    """
+    values = scores.values.astype(float)
+    n_datasets, n_contenders = values.shape
+
+    winner_idx = values.argmax(axis=1)
+    is_best = values == values.max(axis=1, keepdims=True)
+    tie = is_best.sum(axis=1) > 1
+    ordered = np.sort(values, axis=1)
+    if n_contenders > 1:
+        margin = ordered[:, -1] - ordered[:, -2]
+    else:
+        margin = np.full(n_datasets, np.nan)
+
+    outcomes = pd.DataFrame({
+        'winner': scores.columns[winner_idx],
+        'tie': tie,
+        'margin': margin,
+    }, index=scores.index)
+
+    wins = np.zeros((n_datasets, n_contenders))
+    wins[np.arange(n_datasets), winner_idx] = 1
+
+    rng = np.random.RandomState(random_state)
+    resampled = rng.multinomial(
+        n_datasets, np.full(n_datasets, 1 / max(n_datasets, 1)),
+        size=n_samples)
+    sample_percents = resampled.dot(wins) / max(n_datasets, 1)
+    alpha = (1 - confidence) / 2
+    low, high = np.percentile(
+        sample_percents, [100 * alpha, 100 * (1 - alpha)], axis=0)
+
+    summary = pd.DataFrame({
+        'wins': wins.sum(axis=0),
+        'ties': (is_best & tie[:, np.newaxis]).sum(axis=0),
+        'percent': wins.sum(axis=0) / max(n_datasets, 1),
+        'percent_ci_low': low,
+        'percent_ci_high': high,
+    }, index=scores.columns)
+
+    return summary, outcomes
+
+
+def _summarize_wins(scores):
+    """Summarize the wins of each contender, adding the total"""
+    summary, _ = _head_to_head(scores)
+    result = (
+        summary
+        [['wins', 'percent', 'percent_ci_low', 'percent_ci_high']]
+        .sort_values('wins', ascending=False, kind='mergesort')
+    )
+    result.loc['total'] = result[['wins', 'percent']].sum()
+    return result
+
+
+@traced
+def _select_max_per_group(df, by, column):
+    """Select the row with the largest value of column in each group
+
+    Gives the rows of
+    ``df.groupby(by).apply(lambda g: g.nlargest(1, column))``, with ties
+    going to the first row, from one stable sort instead of a sub-frame per
+    group. Rows missing column or a key are dropped, and the
+    rows selected are kept in their original order.
+    """
+    by = list(by)
+    df = df.dropna(subset=[column] + by).reset_index(drop=True)
+    order = np.argsort(-df[column].values.astype(float), kind='mergesort')
+    first = df.iloc[order].drop_duplicates(subset=by).index
+    return df.loc[np.sort(first)].reset_index(drop=True)
+
+
+@requires(_ensure_pipelines_cache)
+@memoize
+def _get_tuning_results_df():
+    df = _load_pipelines_df(
+        columns=('dataset', 'name', 'score', 'ts', 'metric'))
+
+    # sort once so that the first row of each (dataset, template) is the
+    # default pipeline, i.e. the first one evaluated
+    df = df.sort_values(by=['dataset', 'name', 'ts'])
 
     default_scores = (
         df
-        .groupby(['dataset', 'name'])
-        .apply(default_score)
-        .to_frame('default_score')
-        .reset_index()
+        .drop_duplicates(subset=['dataset', 'name'])
+        .dropna(subset=['dataset', 'name'])
         .rename(columns={'name': 'template'})
         [lambda _df: ~_df['template'].str.contains('trivial')]
-        .groupby('dataset')
-        ['default_score']
+        .groupby('dataset', observed=True)
+        ['score']
         .mean()
         .to_frame('default_score')
     )
 
-    min_max_scores = (
-        df
-        .groupby('dataset')
-        .apply(min_max_score)
-        .rename(columns={'min': 'min_score', 'max': 'max_score'})
-    )
-
-    sds = (
-        df
-        .groupby('dataset')
-        ['score']
-        .std()
-        .to_frame('sd')
-    )
+    stats = df.groupby('dataset', observed=True).agg({
+        'score': ['min', 'max', 'std'],
+        'metric': 'first',
+    })
+    stats.columns = ['min_score', 'max_score', 'sd', 'metric']
 
     # adjust for error vs reward-style metrics (make errors negative)
     # adjustment == -1 if the metric is an Error (lower is better)
     adjustments = (
-        df
-        .groupby('dataset')
+        stats
         ['metric']
-        .first()
         .str
         .contains('Error')
         .map({True: -1, False: 1})
         .to_frame('adjustment')
     )
 
-    data = min_max_scores.join(default_scores).join(sds).join(adjustments)
+    data = (
+        stats[['min_score', 'max_score']]
+        .join(default_scores)
+        .join(stats[['sd']])
+        .join(adjustments)
+    )
 
     # compute best score, adjusting for min/max
     data['best_score'] = data['max_score']
@@ -378,28 +2535,89 @@ def _get_tuning_results_df():
     return data
 
 
-@fy.memoize
+@memoize
 def _get_test_results_df():
     filters = _get_filters()
     results_df = ex.get_test_results(**filters)
     _add_tscores(results_df, score_name='cv_score')
-    return results_df
+    return _compact_df(results_df, name='test results')
 
 
-@fy.memoize
+@requires(_get_test_results_df)
+@memoize
+def _get_tuners_df():
+    """Get the tuner types of each test run
+
+    A test run normally uses one tuner for all of its datasets, but every
+    tuner type seen with a test_id is kept, so that a test run is matched by
+    each of its tuners.
+
+    Returns:
+        pd.DataFrame: one row per test_id and tuner type
+    """
+    return (
+        _get_test_results_df()
+        [['test_id', 'tuner_type']]
+        .dropna()
+        .astype(object)
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+
+
+@requires(_ensure_pipelines_cache, _get_tuners_df)
+@memoize
+def _get_pipelines_tuners_df():
+    """Count the pipelines of each test run, joined with its tuner types
+
+    The pipelines are counted per test_id in one pass, and the counts are
+    joined with the tuners of each test run, so a per-tuner count is a
+    groupby over test runs rather than a scan of the pipelines per tuner.
+    Pipelines without a test_id, or whose test run has no tuner, are left
+    out.
+
+    Returns:
+        pd.DataFrame: the test_id, tuner_type, as a categorical, and number
+            of pipelines, with a row per tuner type of each test run
+    """
+    counts = _load_pipelines_df(columns=('test_id',))['test_id'].value_counts()
+    counts = counts[counts > 0]
+    df = pd.DataFrame({
+        'test_id': np.asarray(counts.index, dtype=object),
+        'pipelines': counts.values,
+    })
+    df = df.merge(_get_tuners_df(), on='test_id', how='inner')
+    df['tuner_type'] = df['tuner_type'].astype('category')
+    return df
+
+
+@reads('cache/datasets.feather')
+@memoize
 def _get_datasets_df():
+    path = DATA_DIR.joinpath('cache', 'datasets.feather')
+    if path.exists():
+        return _from_arrow_table(feather.read_table(str(path)))
+
     df = ex.get_datasets()
     df['dataset_id'] = df['dataset'].apply(
         ex.get_dataset_id)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    feather.write_feather(_to_arrow_table(df), str(path),
+                          compression='uncompressed')
     return df
 
 
+@reads('execution_times.tsv')
+@memoize
 def _load_execution_times_df():
     df = pd.read_csv(DATA_DIR.joinpath('execution_times.tsv'), sep='\t')
     df = df.set_index('dataset')
     return df
 
 
+@reads('raw_task_characteristics.tsv')
+@memoize
 def _load_task_characteristics_df():
     path = DATA_DIR.joinpath('raw_task_characteristics.tsv')
     if not os.path.exists(path):
@@ -413,10 +2631,282 @@ def _load_task_characteristics_df():
     return pd.read_csv(path, sep='\t')
 
 
+# ------------------------------------------------------------------------------
+# Aggregations
+# ------------------------------------------------------------------------------
+
+# Reductions that the metrics need are computed by Mongo when the explorer is
+# a MongoPipelineExplorer and the data is not available locally, so that only
+# the reduced result is transferred. Otherwise, they are computed with pandas
+# from the cached or downloaded frames.
+
+# piex serves the pipelines from the solutions collection, giving the name of
+# each solution as its pipeline, and joins the columns in TESTS_COLUMNS onto
+# the test results from the test of the same dataset and test_id
+PIPELINES_COLLECTION = 'solutions'
+TEST_RESULTS_COLLECTION = 'test_results'
+TESTS_COLLECTION = 'tests'
+TESTS_COLUMNS = ('tuner_type',)
+
+
+def _can_push_down(collection):
+    """Whether to compute reductions over collection in Mongo"""
+    if ex.offline:
+        return False
+    if (collection == PIPELINES_COLLECTION
+            and _read_manifest(_get_pipelines_cache_dir()) is not None):
+        return False
+    return isinstance(ex.get(), MongoPipelineExplorer)
+
+
+def _aggregate(collection, pipeline):
+    """Run an aggregation pipeline over the documents passing the filters"""
+    pipeline = [{'$match': _get_filters()}] + pipeline
+    return list(ex.db[collection].aggregate(pipeline, allowDiskUse=True))
+
+
+def _mongo_sigmoid(x):
+    return {'$divide': [1, {'$add': [1, {'$exp': {'$multiply': [-1, x]}}]}]}
+
+
+def _mongo_log10(x):
+    # like np.log10, give -inf for 0 and null for negative numbers
+    return {'$cond': [
+        {'$gt': [x, 0]},
+        {'$log10': x},
+        {'$cond': [{'$eq': [x, 0]}, float('-inf'), None]},
+    ]}
+
+
+# Mongo expressions equivalent to SCORE_MAPPING, up to floating point rounding
+_MONGO_SCORE_MAPPING = {
+    'zero_one_score': lambda x: x,
+    'zero_one_cost': lambda x: x,
+    'real_score': lambda x: _mongo_sigmoid(x),
+    'real_cost': lambda x: {'$subtract': [1, _mongo_sigmoid(x)]},
+    'zero_inf_score': lambda x: _mongo_sigmoid(_mongo_log10(x)),
+    'zero_inf_cost': lambda x: {
+        '$subtract': [1, _mongo_sigmoid(_mongo_log10(x))]},
+}
+
+
+def _mongo_tscore(score_name='cv_score'):
+    """Compile the t-score normalization of _normalize_df to an expression"""
+    metrics_by_type = fy.group_by(_METRIC_TYPES.get, _METRIC_TYPES)
+    return {'$switch': {
+        'branches': [
+            {
+                'case': {'$in': ['$metric', metrics]},
+                'then': _MONGO_SCORE_MAPPING[metric_type]('$' + score_name),
+            }
+            for metric_type, metrics in metrics_by_type.items()
+        ],
+        'default': None,
+    }}
+
+
+def _count_pipelines(pattern=None):
+    """Count the pipelines, or those whose pipeline contains pattern"""
+    if _can_push_down(PIPELINES_COLLECTION):
+        query = _get_filters()
+        if pattern is not None:
+            query['name'] = {'$regex': re.escape(pattern)}
+        return ex.db[PIPELINES_COLLECTION].count_documents(query)
+
+    if pattern is None:
+        return len(_load_pipelines_df(columns=('test_id',)))
+    return _get_pipelines_tag_index('pipeline').count(pattern)
+
+
+def _get_max_tscores(column, pattern):
+    """Get the max t-score per dataset of the test results matching pattern
+
+    Args:
+        column (str): column of the test results to match, e.g. pipeline
+        pattern (str): substring that the column must contain
+    """
+    if _can_push_down(TEST_RESULTS_COLLECTION):
+        match = {column: {'$regex': re.escape(pattern)}}
+        if column in TESTS_COLUMNS:
+            return _get_max_tscores_by_test(match)
+        results = _aggregate(TEST_RESULTS_COLLECTION, [
+            {'$match': match},
+            {'$group': {
+                '_id': '$dataset',
+                't-score': {'$max': _mongo_tscore()},
+            }},
+        ])
+        return (
+            pd.DataFrame.from_records(results, columns=['_id', 't-score'])
+            .rename(columns={'_id': 'dataset'})
+            .set_index('dataset')
+            .sort_index()
+            ['t-score']
+            .astype(float)
+        )
+
+    test_results_df = _get_test_results_df()
+    mask = _get_test_results_tag_index(column).mask(pattern)
+    return (
+        test_results_df
+        [mask]
+        .groupby('dataset', observed=True)
+        ['t-score']
+        .max()
+        .sort_index()
+    )
+
+
+def _get_max_tscores_by_test(match):
+    """Get the max t-score per dataset of the test results whose test matches
+
+    The tests matching are looked up first, and the max t-score of each of
+    their datasets is then computed by Mongo, so that only one row per test
+    and dataset is joined locally.
+    """
+    keys = ['dataset', 'test_id']
+    tests = ex.db[TESTS_COLLECTION].find(
+        dict(_get_filters(), **match), projection=dict.fromkeys(keys, 1))
+    tests_df = pd.DataFrame.from_records(
+        [fy.project(test, keys) for test in tests], columns=keys)
+
+    results = _aggregate(TEST_RESULTS_COLLECTION, [
+        {'$match': {'test_id': {'$in': list(tests_df['test_id'].unique())}}},
+        {'$group': {
+            '_id': {'dataset': '$dataset', 'test_id': '$test_id'},
+            't-score': {'$max': _mongo_tscore()},
+        }},
+    ])
+    results_df = pd.DataFrame.from_records(
+        [dict(r['_id'], **{'t-score': r['t-score']}) for r in results],
+        columns=keys + ['t-score'])
+
+    return (
+        results_df
+        .merge(tests_df.drop_duplicates(), on=keys)
+        .astype({'t-score': float})
+        .groupby('dataset')
+        ['t-score']
+        .max()
+        .sort_index()
+    )
+
+
+def _get_final_search_results():
+    """Get the last test result, by elapsed time, of each search run"""
+    columns = ['test_id', 'dataset', 'elapsed', 'iterations']
+    if _can_push_down(TEST_RESULTS_COLLECTION):
+        results = _aggregate(TEST_RESULTS_COLLECTION, [
+            {'$match': {'elapsed': {'$ne': None}}},
+            {'$sort': {'elapsed': -1}},
+            {'$group': {
+                '_id': {'test_id': '$test_id', 'dataset': '$dataset'},
+                'elapsed': {'$first': '$elapsed'},
+                'iterations': {'$first': '$iterations'},
+            }},
+        ])
+        return pd.DataFrame.from_records(
+            [dict(r['_id'], **fy.omit(r, ['_id'])) for r in results],
+            columns=columns)
+
+    test_results = _get_test_results_df()
+    return _select_max_per_group(
+        test_results[columns], ['test_id', 'dataset'], 'elapsed')
+
+
+# search runs that take longer than this are errored outliers
+MAX_SEARCH_ELAPSED = 60 * 60 * 3
+
+
+def _iter_test_results(columns, chunksize=STATS_CHUNKSIZE):
+    """Iterate over the test results in frames of at most chunksize rows
+
+    When reductions can be pushed down, the results are read from a Mongo
+    cursor, so that only one chunk is held in memory at a time.
+    """
+    columns = list(columns)
+    if _can_push_down(TEST_RESULTS_COLLECTION):
+        projection = dict.fromkeys(columns, 1)
+        projection['_id'] = 0
+        cursor = ex.db[TEST_RESULTS_COLLECTION].find(
+            _get_filters(), projection=projection, batch_size=chunksize)
+        for records in fy.chunks(chunksize, cursor):
+            yield pd.DataFrame.from_records(records, columns=columns)
+    else:
+        test_results = _get_test_results_df()
+        for start in range(0, len(test_results), chunksize):
+            yield test_results[columns].iloc[start:start + chunksize]
+
+
+def _stream_throughput(chunks, groups=None):
+    """Compute the pipelines evaluated per second from chunks of test results
+
+    Only the last result of each search run seen so far, by elapsed time, is
+    kept between chunks, so memory grows with the number of search runs and
+    not with the number of results.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): test results with the test_id,
+            dataset, elapsed and iterations columns
+        groups (pd.Series, optional): mapping of dataset to a group, such as
+            its task type, to also compute the throughput of each group
+
+    Returns:
+        pd.Series: the throughput of each group, and of all search runs under
+            ``total``
+    """
+    by = ['test_id', 'dataset']
+    final = None
+    for chunk in chunks:
+        if final is not None:
+            chunk = pd.concat([final, chunk], ignore_index=True, sort=False)
+        final = _select_max_per_group(chunk, by, 'elapsed')
+
+    if final is None:
+        return pd.Series({'total': np.nan})
+    final = final[final['elapsed'] < MAX_SEARCH_ELAPSED]
+
+    totals = final[['iterations', 'elapsed']].sum()
+    throughput = pd.Series({'total': totals['iterations'] / totals['elapsed']})
+    if groups is not None:
+        sums = (
+            final[['iterations', 'elapsed']]
+            .groupby(final['dataset'].map(groups).values)
+            .sum()
+        )
+        throughput = pd.concat(
+            [sums['iterations'] / sums['elapsed'], throughput])
+
+    return throughput
+
+
+@requires(_ensure_pipelines_cache)
+@reads('cache/pipelines/_manifest.json')
+@memoize
+def _prepare_pipelines():
+    """Build the pipelines cache and its tag index, unless reductions can be
+    pushed down"""
+    if not _can_push_down(PIPELINES_COLLECTION):
+        _ensure_pipelines_cache()
+        _get_pipelines_tag_index('pipeline')
+
+
+@requires(_get_test_results_df)
+@memoize
+def _prepare_test_results():
+    """Load the test results and their tag indexes, unless reductions can be
+    pushed down"""
+    if not _can_push_down(TEST_RESULTS_COLLECTION):
+        _get_test_results_tag_index('pipeline')
+        _get_test_results_tag_index('tuner_type')
+
+
 # ------------------------------------------------------------------------------
 # Run experiments
 # ------------------------------------------------------------------------------
 
+@requires(_load_task_characteristics_df, _get_datasets_df)
+@writes('task_characteristics.csv', 'task_characteristics.tex')
 def make_table_3():
     df = _load_task_characteristics_df()
     df = df[['dataset_id', 'n', 'm', 'classes',
@@ -432,7 +2922,7 @@ def make_table_3():
     })
 
     # set number of classes to nan for non-classification datasets
-    tmp = ex.get_datasets()
+    tmp = _get_datasets_df()
     msk = tmp['task_type'] == 'classification'
     cls_ids = tmp[msk]
     cls_ids = cls_ids['dataset'].tolist()
@@ -461,13 +2951,13 @@ def make_table_3():
     return summary
 
 
+@requires(_ensure_pipelines_cache, _get_datasets_df)
+@writes('table4.csv', 'table4.tex')
 def make_table_4():
-    df = _load_pipelines_df()
+    df = _load_pipelines_df(columns=('dataset',))
     datasets = df['dataset'].unique()
 
     _all_datasets = _get_datasets_df()
-    _all_datasets['dataset_id'] = _all_datasets['dataset'].apply(
-        ex.get_dataset_id)
 
     datasets_df = pd.merge(
         pd.DataFrame(datasets, columns=['dataset_id']),
@@ -491,8 +2981,10 @@ def make_table_4():
     return result
 
 
+@requires(_load_execution_times_df)
+@writes('figure4.{fmt}', 'execution_time.csv', 'execution_time_summary.csv')
 def make_figure_4():
-    df = _load_execution_times_df()
+    df = _load_execution_times_df().copy()
 
     # normalize data.
     df['total'] = df['abz_time']
@@ -533,21 +3025,13 @@ def make_figure_4():
     return summary
 
 
+@requires(_load_baselines_df, _ensure_pipelines_cache, _get_datasets_df)
+@writes('figure6.{fmt}', 'figurex.csv', 'performance_vs_baseline.csv')
 def make_figure_x():
     baselines_df = _load_baselines_df()
 
     problems = list(baselines_df.index)
-    best_pipelines = [_get_best_pipeline(problem) for problem in problems]
-    mlz_pipelines_df = pd.DataFrame.from_records(
-        [
-            pipeline.to_dict()
-            for pipeline in best_pipelines
-            if pipeline is not None
-        ]
-    )
-    mlz_pipelines_df['problem'] = mlz_pipelines_df['dataset'].str.replace(
-        '_dataset_TRAIN', '')
-    mlz_pipelines_df = mlz_pipelines_df.set_index('problem')
+    mlz_pipelines_df = _get_best_pipelines(problems).set_index('problem')
     _add_tscores(mlz_pipelines_df)
 
     combined_df = baselines_df.join(
@@ -605,6 +3089,8 @@ def make_figure_x():
     result.to_csv(fn)
 
 
+@requires(_get_tuning_results_df)
+@writes('figure5.{fmt}')
 def make_figure_5():
     data = _get_tuning_results_df()
     delta = data['delta'].dropna()
@@ -627,9 +3113,10 @@ def make_figure_5():
     return data
 
 
+@requires(_prepare_pipelines)
+@writes('total_pipelines.txt')
 def compute_total_pipelines():
-    df = _load_pipelines_df()
-    n_pipelines = df.shape[0]
+    n_pipelines = _count_pipelines()
     result = '{} total pipelines evaluated' .format(n_pipelines)
 
     fn = OUTPUT_DIR.joinpath('total_pipelines.txt')
@@ -639,16 +3126,14 @@ def compute_total_pipelines():
     return result
 
 
+@requires(_prepare_test_results)
+@writes('pipelines_second.txt')
 def compute_pipelines_second():
-    test_results = _get_test_results_df()
-    test_results_final = (
-        test_results
-        .groupby(['test_id', 'dataset'])
-        .apply(lambda group: group.nlargest(1, 'elapsed'))
-    )
+    test_results_final = _get_final_search_results()
 
     # filter out errored outliers with elapsed over 3h
-    test_results_final = test_results_final.query('elapsed < 60*60*3')
+    test_results_final = test_results_final[
+        test_results_final['elapsed'] < MAX_SEARCH_ELAPSED]
 
     n_pipelines = test_results_final['iterations'].sum()
     total_seconds_elapsed = test_results_final['elapsed'].sum()
@@ -661,12 +3146,31 @@ def compute_pipelines_second():
     return result
 
 
+@requires(_prepare_test_results, _get_datasets_df)
+@writes('pipelines_second_by_task_type.csv')
+def compute_pipelines_second_by_task_type():
+    """Compute the pipelines evaluated per second of each task type"""
+    task_types = _get_datasets_df().set_index('dataset_id')['task_type']
+    columns = ['test_id', 'dataset', 'elapsed', 'iterations']
+    result = (
+        _stream_throughput(_iter_test_results(columns), groups=task_types)
+        .to_frame('pipelines_second')
+    )
+
+    fn = OUTPUT_DIR.joinpath('pipelines_second_by_task_type.csv')
+    result.to_csv(fn)
+
+    return result
+
+
 def compute_performance_vs_baseline():
     """Compute performance vs human baseline (Section V.B)"""
     # see make_figure_6 for implementation
     pass
 
 
+@requires(_get_tuning_results_df)
+@writes('5_4_tuning_improvement_sds.txt')
 def compute_tuning_improvement_sds_5_4():
     """Compute average improvement during tuning, in sds"""
     data = _get_tuning_results_df()
@@ -682,6 +3186,8 @@ def compute_tuning_improvement_sds_5_4():
     return result
 
 
+@requires(_get_tuning_results_df)
+@writes('5_4_tuning_improvement_pct_of_tasks.txt')
 def compute_tuning_improvement_pct_of_tasks_5_4():
     """Compute pct of tasks that improve by >1sd during tuning"""
     data = _get_tuning_results_df()
@@ -697,11 +3203,12 @@ def compute_tuning_improvement_pct_of_tasks_5_4():
     return result
 
 
+@requires(_prepare_pipelines)
+@writes('5_6_npipelines_xgbrf.csv')
 def compute_npipelines_xgbrf_5_6():
     """Compute the total number of XGB/RF pipelines evaluated"""
-    df = _load_pipelines_df()
-    npipelines_rf = np.sum(df['pipeline'].str.contains('random_forest'))
-    npipelines_xgb = np.sum(df['pipeline'].str.contains('xgb'))
+    npipelines_rf = _count_pipelines('random_forest')
+    npipelines_xgb = _count_pipelines('xgb')
     total = npipelines_rf + npipelines_xgb
     result = pd.DataFrame(
         [npipelines_rf, npipelines_xgb, total],
@@ -715,70 +3222,49 @@ def compute_npipelines_xgbrf_5_6():
     return result
 
 
+@requires(_prepare_test_results)
+@writes('5_6_xgb_wins_pct.csv')
 def compute_xgb_wins_pct_5_6():
     """Compute the pct of tasks for which XGB pipelines beat RF pipelines"""
-    test_results_df = _get_test_results_df()
-
     rf_results_df = (
-        test_results_df
-        [lambda _df: (
-            _df['pipeline']
-            .str
-            .contains('random_forest')
-            .fillna(False)
-        )]
-        .groupby('dataset')
-        ['t-score']
-        .max()
+        _get_max_tscores('pipeline', 'random_forest')
         .to_frame('RF')
     )
-
     xgb_results_df = (
-        test_results_df
-        [lambda _df: _df['pipeline'].str.contains('xgb').fillna(False)]
-        .groupby('dataset')
-        ['t-score']
-        .max()
+        _get_max_tscores('pipeline', 'xgb')
         .to_frame('XGB')
     )
 
-    result = (
+    result = _summarize_wins(
         rf_results_df
         .join(xgb_results_df)
         .fillna(0)
-        .apply(np.argmax, axis=1)
-        .value_counts()
-        .to_frame('wins')
-        .assign(percent=lambda _df: _df['wins'] / np.sum(_df['wins']))
     )
 
-    # add total
-    result.loc(axis=0)['total'] = result.sum()
-
     fn = OUTPUT_DIR.joinpath('5_6_xgb_wins_pct.csv')
     result.to_csv(fn)
 
     return result
 
 
+@requires(_get_pipelines_tuners_df)
+@writes('5_7_npipelines_sematern52.csv')
 def compute_npipelines_maternse_5_7():
     """Compute the total number of Matern-EI/SE-EI pipelines evaluated"""
-    pipelines_df = _load_pipelines_df()
-    test_results_df = _get_test_results_df()
-
-    def find_tuner_test_ids(tuner):
-        mask = test_results_df['tuner_type'].str.contains(tuner).fillna(False)
-        return test_results_df.loc[mask, 'test_id']
+    npipelines_df = _get_pipelines_tuners_df()
 
-    se_test_ids = find_tuner_test_ids('gpei')
-    se_matches = pipelines_df['test_id'].isin(se_test_ids)
-    se_pipelines = pipelines_df.loc[se_matches]
-    n_se_pipelines = len(se_pipelines)
+    def count_tuner_pipelines(tuner):
+        mask = npipelines_df['tuner_type'].str.contains(tuner, regex=False)
+        # a test run is counted once, even if several of its tuners match
+        return (
+            npipelines_df[mask]
+            .drop_duplicates(subset=['test_id'])
+            ['pipelines']
+            .sum()
+        )
 
-    matern_test_ids = find_tuner_test_ids('gpmatern52ei')
-    matern_matches = pipelines_df['test_id'].isin(matern_test_ids)
-    matern_pipelines = pipelines_df.loc[matern_matches]
-    n_matern_pipelines = len(matern_pipelines)
+    n_se_pipelines = count_tuner_pipelines('gpei')
+    n_matern_pipelines = count_tuner_pipelines('gpmatern52ei')
 
     total = n_se_pipelines + n_matern_pipelines
     result = pd.DataFrame(
@@ -793,75 +3279,401 @@ def compute_npipelines_maternse_5_7():
     return result
 
 
+@requires(_prepare_test_results)
+@writes('5_7_matern_wins_pct.csv')
 def compute_matern_wins_pct_5_7():
     """Compute matern wins pct
 
     Compute the pct of tasks for which the best pipeline as tuned by
     GP-Matern52-EI beats the best pipeline as tuned by GP-SE-EI.
     """
-    test_results_df = _get_test_results_df()
-
     gp_se_ei_results_df = (
-        test_results_df
-        [lambda _df: _df['tuner_type'].str.contains('gpei').fillna(False)]
-        .groupby('dataset')
-        ['t-score']
-        .max()
+        _get_max_tscores('tuner_type', 'gpei')
         .to_frame('GP-SE-EI')
     )
-
     gp_matern52_ei_results_df = (
-        test_results_df
-        [lambda _df: (
-            _df['tuner_type']
-            .str
-            .contains('gpmatern52ei')
-            .fillna(False)
-        )]
-        .groupby('dataset')
-        ['t-score']
-        .max()
+        _get_max_tscores('tuner_type', 'gpmatern52ei')
         .to_frame('GP-Matern52-EI')
     )
 
-    result = (
+    result = _summarize_wins(
         gp_se_ei_results_df
         .join(gp_matern52_ei_results_df)
         .fillna(0)
-        .apply(np.argmax, axis=1)
-        .value_counts()
-        .to_frame('wins')
-        .assign(percent=lambda _df: _df['wins'] / np.sum(_df['wins']))
     )
 
-    # add total
-    result.loc(axis=0)['total'] = result.sum()
-
     fn = OUTPUT_DIR.joinpath('5_7_matern_wins_pct.csv')
     result.to_csv(fn)
 
     return result
 
 
-def main():
-    """Call all of the results generating functions defined here"""
+def _get_loaders(targets):
+    """Get the loaders required by targets, in an order respecting deps"""
+    loaders = []
+
+    def visit(func):
+        for loader in getattr(func, 'requires', ()):
+            if loader not in loaders:
+                visit(loader)
+                loaders.append(loader)
+
+    for target in targets:
+        visit(target)
+    return loaders
+
+
+def _run_loaders(loaders, jobs):
+    """Run each loader once, concurrently where dependencies allow
+
+    Returns:
+        dict: exceptions of the loaders that failed, or whose requirements
+            failed, keyed by loader
+    """
+    failed = {}
+    done = set()
+    pending = list(loaders)
+    running = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            for loader in list(pending):
+                deps = getattr(loader, 'requires', ())
+                failed_deps = [d for d in deps if d in failed]
+                if failed_deps:
+                    failed[loader] = failed[failed_deps[0]]
+                    pending.remove(loader)
+                elif all(d in done for d in deps):
+                    running[executor.submit(loader)] = loader
+                    pending.remove(loader)
+
+            if not running:
+                continue
+
+            finished, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                loader = running.pop(future)
+                if future.exception() is not None:
+                    failed[loader] = future.exception()
+                else:
+                    done.add(loader)
+
+    return failed
+
+
+def _run_target(name, profile_dir=None):
+    """Call the target named name, reporting rather than raising failures
+
+    Args:
+        name (str): name of the target
+        profile_dir (path-like, optional): if given, dump the cProfile stats
+            of the target to a file named after it in this directory
+
+    Returns:
+        bool: whether the target succeeded
+    """
+    obj = getattr(sys.modules[__name__], name)
+    profile = cProfile.Profile() if profile_dir is not None else None
+    try:
+        print(f'Calling {name}...')
+        with tracer.span(name, kind='target') as span:
+            if profile is not None:
+                profile.enable()
+            try:
+                span['rows'] = _count_rows(obj())
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    path = pathlib.Path(profile_dir).joinpath(name + '.prof')
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    profile.dump_stats(str(path))
+    except Exception:
+        print(f'Calling {name}...FAILED')
+        traceback.print_exc()
+        return False
+    else:
+        print(f'Calling {name}...DONE')
+        return True
+
+
+def _get_targets():
     this = sys.modules[__name__]
     names = set(dir(this)) - {'main'}
-    print(f'DATA_DIR is {DATA_DIR}')
-    print(f'OUTPUT_DIR is {OUTPUT_DIR}')
+    targets = []
     for name in sorted(names):
         if name.startswith('make_') or name.startswith('compute_'):
             obj = getattr(this, name)
             if isinstance(obj, types.FunctionType):
-                try:
-                    print(f'Calling {name}...')
-                    obj()
-                except Exception:
-                    print(f'Calling {name}...FAILED')
-                    traceback.print_exc()
-                    continue
-                else:
-                    print(f'Calling {name}...DONE')
+                targets.append(obj)
+    return targets
+
+
+# The build cache maps each target to the fingerprint of its last successful
+# run. A fingerprint hashes the source of the target and of the module-level
+# functions, classes and constants it references, transitively, together with
+# the contents of the files read by its loaders and the figure options.
+# Targets whose loaders read data that cannot be fingerprinted, such as the
+# test results, which are only held remotely, are always run, as are targets
+# whose declared output files are missing.
+
+def _get_build_cache_path():
+    return OUTPUT_DIR.joinpath('.buildcache.json')
+
+
+def _read_build_cache():
+    path = _get_build_cache_path()
+    if not path.exists():
+        return {}
+    with path.open('r') as f:
+        return json.load(f)
+
+
+def _write_build_cache(build_cache):
+    path = _get_build_cache_path()
+    tmp_path = path.with_name(path.name + '.tmp')
+    with tmp_path.open('w') as f:
+        json.dump(build_cache, f, indent=2, sort_keys=True)
+    os.replace(str(tmp_path), str(path))
+
+
+def _hash_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _get_referenced_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_referenced_names(const)
+    return names
+
+
+def _get_constant_source(obj, names):
+    """Get a stable source of a constant, or None if it has none
+
+    Containers are rendered with their items sorted, and functions, such as
+    the lambdas of SCORE_MAPPING, by their source, whose referenced names
+    are added to names.
+    """
+    if isinstance(obj, (bool, int, float, str, bytes, type(None))):
+        return repr(obj)
+    if isinstance(obj, FunctionType):
+        names.extend(_get_referenced_names(obj.__code__))
+        return inspect.getsource(obj)
+    if isinstance(obj, dict):
+        items = [
+            (_get_constant_source(k, names), _get_constant_source(v, names))
+            for k, v in obj.items()
+        ]
+        if any(v is None for item in items for v in item):
+            return None
+        return '{' + ', '.join(f'{k}: {v}' for k, v in sorted(items)) + '}'
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = [_get_constant_source(v, names) for v in obj]
+        if any(v is None for v in items):
+            return None
+        if isinstance(obj, (set, frozenset)):
+            items = sorted(items)
+        return f'{type(obj).__name__}(' + ', '.join(items) + ')'
+    return None
+
+
+def _get_source_closure(func):
+    """Get the source of func and of the module-level objects it references"""
+    this = sys.modules[__name__]
+    sources = {}
+    pending = [func.__name__]
+    while pending:
+        name = pending.pop()
+        if name in sources or not hasattr(this, name):
+            continue
+        obj = getattr(this, name)
+        if isinstance(obj, (FunctionType, type)):
+            if getattr(obj, '__module__', None) != __name__:
+                continue
+            sources[name] = inspect.getsource(obj)
+            members = [inspect.unwrap(obj)]
+            if isinstance(obj, type):
+                members = [
+                    inspect.unwrap(v) for v in vars(obj).values()
+                    if isinstance(v, FunctionType)
+                ]
+            for member in members:
+                pending.extend(_get_referenced_names(member.__code__))
+        else:
+            source = _get_constant_source(obj, pending)
+            if source is not None:
+                sources[name] = source
+    return sources
+
+
+def _get_fingerprint(target):
+    """Get the fingerprint of target, or None if its data is not known"""
+    h = hashlib.sha256()
+    for name, source in sorted(_get_source_closure(target).items()):
+        h.update(name.encode())
+        h.update(source.encode())
+
+    for loader in _get_loaders([target]):
+        paths = getattr(loader, 'reads', None)
+        if paths is None:
+            if getattr(loader, 'requires', ()):
+                # derived from the data of the loaders it requires
+                continue
+            return None
+        for path in paths:
+            path = DATA_DIR.joinpath(path)
+            if not path.exists():
+                return None
+            h.update(str(path).encode())
+            h.update(_hash_file(str(path)).encode())
+
+    h.update(json.dumps(_savefig_options, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _get_outputs(target):
+    """Get the paths of the files that target declares it writes"""
+    paths = []
+    for path in getattr(target, 'writes', ()):
+        if '{fmt}' in path:
+            paths.extend(
+                path.format(fmt=fmt) for fmt in _savefig_options['formats'])
+        else:
+            paths.append(path)
+    return [OUTPUT_DIR.joinpath(path) for path in paths]
+
+
+def _is_up_to_date(target, fingerprint, build_cache):
+    """Whether target ran with this fingerprint and its outputs still exist"""
+    if fingerprint is None or build_cache.get(target.__name__) != fingerprint:
+        return False
+    return all(path.exists() for path in _get_outputs(target))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of loaders and targets to run concurrently')
+    parser.add_argument(
+        '--offline', action='store_true',
+        help='only use local caches and snapshot, never connect to Mongo or '
+             'S3')
+    parser.add_argument(
+        '--connect-timeout', type=float, default=MONGO_CONNECT_TIMEOUT,
+        help='seconds to wait for Mongo before falling back to S3')
+    parser.add_argument(
+        '--formats', type=lambda s: s.split(','),
+        default=list(FIGURE_FORMATS),
+        help='comma-separated formats to save figures in, e.g. png,pdf,eps')
+    parser.add_argument(
+        '--dpi', type=float, default=None,
+        help='resolution of raster figures, defaults to savefig.dpi')
+    parser.add_argument(
+        '--force', action='store_true',
+        help='run all targets, even those whose data and code are unchanged')
+    parser.add_argument(
+        '--trace', type=pathlib.Path, default=None,
+        help='json lines file to append timing spans to, e.g. '
+             'output/trace.jsonl; nothing is traced by default')
+    parser.add_argument(
+        '--profile', type=pathlib.Path, default=None, metavar='DIR',
+        help='dump the cProfile stats of each target to DIR/<target>.prof')
+    parser.add_argument(
+        '--create-snapshot', action='store_true',
+        help='snapshot the explorer data to DATA_DIR/snapshot, which is then '
+             'served by a local explorer in offline mode')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Call all of the results generating functions defined here
+
+    The loaders that the targets require are run first, each once, and the
+    targets then run in a pool of forked processes that inherit the loaded
+    data. With --jobs 1, everything runs in this process. Targets whose data
+    and code are unchanged since their last successful run are skipped,
+    unless --force is given.
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    explorer = None
+    snapshot_dir = _get_snapshot_dir()
+    if args.offline and snapshot_dir.joinpath('_manifest.json').exists():
+        explorer = LocalPipelineExplorer(snapshot_dir)
+    ex.configure(offline=args.offline, timeout=args.connect_timeout,
+                 explorer=explorer)
+    # target processes already use the CPUs
+    _configure_savefig(formats=args.formats, dpi=args.dpi,
+                       parallel=args.jobs == 1)
+    tracer.configure(args.trace)
+    print(f'DATA_DIR is {DATA_DIR}')
+    print(f'OUTPUT_DIR is {OUTPUT_DIR}')
+
+    if args.create_snapshot:
+        create_snapshot()
+        print(f'Created snapshot in {_get_snapshot_dir()}')
+
+    build_cache = {} if args.force else _read_build_cache()
+    fingerprints = {}
+    targets = []
+    for target in _get_targets():
+        name = target.__name__
+        fingerprints[name] = _get_fingerprint(target)
+        if _is_up_to_date(target, fingerprints[name], build_cache):
+            print(f'Calling {name}...UNCHANGED')
+        else:
+            targets.append(target)
+
+    failed_loaders = _run_loaders(_get_loaders(targets), args.jobs)
+
+    runnable = []
+    for target in targets:
+        failed = [
+            loader for loader in _get_loaders([target])
+            if loader in failed_loaders
+        ]
+        if failed:
+            error = failed_loaders[failed[0]]
+            print(f'Calling {target.__name__}...FAILED')
+            traceback.print_exception(type(error), error, error.__traceback__)
+        else:
+            runnable.append(target.__name__)
+            if fingerprints[target.__name__] is None:
+                # the loaders may have just created the files they read
+                fingerprints[target.__name__] = _get_fingerprint(target)
+
+    def record(name):
+        if fingerprints[name] is not None:
+            build_cache[name] = fingerprints[name]
+            _write_build_cache(build_cache)
+
+    if args.jobs == 1:
+        for name in runnable:
+            if _run_target(name, profile_dir=args.profile):
+                record(name)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(args.jobs) as executor:
+        futures = {
+            executor.submit(_run_target, name, profile_dir=args.profile): name
+            for name in runnable
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                succeeded = future.result()
+            except Exception:
+                # the worker process died, e.g. it ran out of memory
+                print(f'Calling {futures[future]}...FAILED')
+                traceback.print_exc()
+            else:
+                if succeeded:
+                    record(futures[future])
 
 
 if __name__ == '__main__':
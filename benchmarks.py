@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the loaders and computations of analysis.py on synthetic data
+
+The pipelines and test results are generated with the columns that the
+explorer returns, and are served by an in-process stand-in explorer, so that
+no Mongo or S3 access is needed. For each size, the steps are run twice: once
+to time them and once to measure their peak of traced memory, since tracing
+the allocations slows them down. The results are printed as a table.
+"""
+
+import argparse
+import pathlib
+import tempfile
+import time
+import tracemalloc
+import warnings
+from contextlib import redirect_stdout
+from os import devnull
+
+import numpy as np
+import pandas as pd
+
+import analysis
+
+DEFAULT_SIZES = (10**4, 10**5, 10**6)
+
+N_DATASETS = 450
+N_TEMPLATES = 12
+N_PIPELINES = 2000
+TUNER_TYPES = ('gp', 'gpei', 'gpmatern52ei', 'uniform')
+PRIMITIVES = ('xgb', 'random_forest', 'extra_trees', 'sgd', 'logistic')
+TASK_TYPES = ('classification', 'regression', 'collaborative_filtering')
+DATA_MODALITIES = ('single_table', 'multi_table', 'timeseries', 'image')
+
+
+# ------------------------------------------------------------------------------
+# Synthetic data
+# ------------------------------------------------------------------------------
+
+def _get_dataset_ids(n_datasets=N_DATASETS):
+    return np.array(['dataset_{:04d}'.format(i) for i in range(n_datasets)],
+                    dtype=object)
+
+
+def _get_test_ids(n_test_ids):
+    start = int(analysis.TEST_ID_START)
+    return np.array([str(start + i) for i in range(n_test_ids)], dtype=object)
+
+
+def _get_dataset_metrics(rng, n_datasets=N_DATASETS):
+    metrics = np.array(sorted(analysis._METRIC_TYPES), dtype=object)
+    return metrics[rng.randint(len(metrics), size=n_datasets)]
+
+
+def _make_scores(rng, metrics):
+    """Generate scores in the range of the type of each metric"""
+    types = pd.Series(metrics).map(analysis._METRIC_TYPES).values
+    scores = rng.rand(len(metrics))
+    unbounded = np.isin(types, ['zero_inf_score', 'zero_inf_cost'])
+    scores[unbounded] *= 1000
+    real = np.isin(types, ['real_score', 'real_cost'])
+    scores[real] = rng.randn(real.sum())
+    return scores
+
+
+def make_pipelines_df(n_rows, random_state=0):
+    """Generate the pipelines of n_rows search iterations"""
+    rng = np.random.RandomState(random_state)
+    datasets = _get_dataset_ids()
+    metrics = _get_dataset_metrics(np.random.RandomState(random_state))
+    templates = np.array(
+        ['template_{:02d}'.format(i) for i in range(N_TEMPLATES - 1)]
+        + ['trivial_template'], dtype=object)
+    pipelines = np.array([
+        '{{"primitives": ["{}"], "hyperparameters": {}}}'.format(
+            PRIMITIVES[i % len(PRIMITIVES)], i)
+        for i in range(N_PIPELINES)
+    ], dtype=object)
+    test_ids = _get_test_ids(max(n_rows // 10000, 1))
+
+    dataset_idx = rng.randint(len(datasets), size=n_rows)
+    return pd.DataFrame({
+        'dataset': datasets[dataset_idx],
+        'name': templates[rng.randint(len(templates), size=n_rows)],
+        'score': _make_scores(rng, metrics[dataset_idx]),
+        'ts': (
+            pd.Timestamp('2019-01-01')
+            + pd.to_timedelta(np.arange(n_rows), unit='s')
+        ),
+        'metric': metrics[dataset_idx],
+        'pipeline': pipelines[rng.randint(len(pipelines), size=n_rows)],
+        'test_id': test_ids[rng.randint(len(test_ids), size=n_rows)],
+        'rank': rng.rand(n_rows),
+    })
+
+
+def make_test_results_df(n_rows, random_state=0):
+    """Generate n_rows test results, one per template of a search run"""
+    rng = np.random.RandomState(random_state + 1)
+    datasets = _get_dataset_ids()
+    metrics = _get_dataset_metrics(np.random.RandomState(random_state))
+    n_test_ids = max(n_rows // N_DATASETS // N_TEMPLATES, 1)
+    test_ids = _get_test_ids(n_test_ids)
+    tuner_types = np.array(TUNER_TYPES, dtype=object)
+    pipelines = np.array(
+        ['{}_pipeline'.format(p) for p in PRIMITIVES], dtype=object)
+
+    dataset_idx = rng.randint(len(datasets), size=n_rows)
+    test_idx = rng.randint(n_test_ids, size=n_rows)
+    return pd.DataFrame({
+        'dataset': datasets[dataset_idx],
+        'test_id': test_ids[test_idx],
+        'cv_score': _make_scores(rng, metrics[dataset_idx]),
+        'metric': metrics[dataset_idx],
+        'pipeline': pipelines[rng.randint(len(pipelines), size=n_rows)],
+        # each search run uses one tuner
+        'tuner_type': tuner_types[test_idx % len(tuner_types)],
+        'elapsed': rng.exponential(600, size=n_rows),
+        'iterations': rng.randint(1, 500, size=n_rows),
+    })
+
+
+class BenchmarkExplorer:
+    """Stand-in explorer serving synthetic frames from memory"""
+
+    def __init__(self, pipelines_df, test_results_df):
+        self.pipelines_df = pipelines_df
+        self.test_results_df = test_results_df
+
+    @staticmethod
+    def _filter(df, filters):
+        for column, condition in filters.items():
+            df = df[df[column] >= condition['$gte']]
+        return df.reset_index(drop=True)
+
+    def get_pipelines(self, **filters):
+        return self._filter(self.pipelines_df, filters)
+
+    def get_test_results(self, **filters):
+        return self._filter(self.test_results_df, filters)
+
+    def get_datasets(self):
+        datasets = _get_dataset_ids()
+        rng = np.random.RandomState(0)
+        return pd.DataFrame({
+            'dataset': [d.replace('dataset_', 'problem_') for d in datasets],
+            'task_type': np.array(TASK_TYPES)[
+                rng.randint(len(TASK_TYPES), size=len(datasets))],
+            'data_modality': np.array(DATA_MODALITIES)[
+                rng.randint(len(DATA_MODALITIES), size=len(datasets))],
+        })
+
+    def get_dataset_id(self, problem):
+        return problem.replace('problem_', 'dataset_')
+
+
+# ------------------------------------------------------------------------------
+# Benchmarks
+# ------------------------------------------------------------------------------
+
+# steps in the order they run, so that each can use the memoized results of
+# the steps before it, as in a run of analysis.py
+STEPS = [
+    ('build pipelines cache', analysis._ensure_pipelines_cache),
+    ('load pipelines', lambda: analysis._load_pipelines_df(
+        columns=('dataset', 'name', 'score', 'ts', 'metric'))),
+    ('tuning results', analysis._get_tuning_results_df),
+    ('load test results', analysis._get_test_results_df),
+    ('t-scores', lambda: analysis._normalize_df(
+        analysis._get_test_results_df(), score_name='cv_score')),
+    ('pipelines/second', analysis.compute_pipelines_second),
+    ('pipelines/second by task type',
+     analysis.compute_pipelines_second_by_task_type),
+    ('5.6 XGB/RF pipelines', analysis.compute_npipelines_xgbrf_5_6),
+    ('5.6 XGB vs RF wins', analysis.compute_xgb_wins_pct_5_6),
+    ('5.7 Matern/SE pipelines', analysis.compute_npipelines_maternse_5_7),
+    ('5.7 Matern vs SE wins', analysis.compute_matern_wins_pct_5_7),
+]
+
+
+def _reset(workdir):
+    """Forget the memoized data and point analysis at empty directories"""
+    for obj in vars(analysis).values():
+        if hasattr(obj, 'invalidate_all'):
+            obj.invalidate_all()
+    analysis.DATA_DIR = workdir.joinpath('data')
+    analysis.OUTPUT_DIR = workdir.joinpath('output')
+    analysis.DATA_DIR.mkdir(parents=True)
+    analysis.OUTPUT_DIR.mkdir(parents=True)
+
+
+def _time(func):
+    start = time.perf_counter()
+    with open(devnull, 'w') as fnull, redirect_stdout(fnull):
+        func()
+    return time.perf_counter() - start
+
+
+def _trace_peak(func):
+    tracemalloc.start()
+    try:
+        with open(devnull, 'w') as fnull, redirect_stdout(fnull):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _run_steps(measure):
+    """Measure each step from scratch, in a fresh working directory"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _reset(pathlib.Path(tmpdir))
+        return [measure(func) for _, func in STEPS]
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, random_state=0):
+    """Run each step on synthetic data of each size
+
+    Returns:
+        pd.DataFrame: the seconds and peak MiB of each step and size
+    """
+    rows = []
+    for size in sizes:
+        explorer = BenchmarkExplorer(
+            make_pipelines_df(size, random_state=random_state),
+            make_test_results_df(size, random_state=random_state))
+        analysis.ex.configure(explorer=explorer)
+        times = _run_steps(_time)
+        peaks = _run_steps(_trace_peak)
+        for (name, _), seconds, peak in zip(STEPS, times, peaks):
+            rows.append({
+                'step': name,
+                'rows': size,
+                'seconds': seconds,
+                'peak_mib': peak / 2**20,
+            })
+            print(f'{name} ({size} rows): {seconds:.3f}s, '
+                  f'{peak / 2**20:.1f}MiB')
+
+    return pd.DataFrame(rows)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=lambda s: int(float(s)), nargs='+',
+        default=list(DEFAULT_SIZES),
+        help='numbers of rows to benchmark, e.g. 1e4 1e5 1e6 1e7')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='seed of the synthetic data')
+    parser.add_argument(
+        '--output', type=pathlib.Path, default=None,
+        help='csv file to save the results to')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results = run_benchmarks(sizes=args.sizes, random_state=args.seed)
+
+    for value in ['seconds', 'peak_mib']:
+        table = results.pivot(index='step', columns='rows', values=value)
+        table = table.reindex([name for name, _ in STEPS])
+        print()
+        print(f'{value}:')
+        print(table.round(3).to_string())
+
+    if args.output is not None:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
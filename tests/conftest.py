@@ -0,0 +1,71 @@
+"""Fixtures serving synthetic test runs from an in-memory Mongo"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analysis
+
+DATASETS = ['a_dataset_TRAIN', 'b_dataset_TRAIN', 'c_dataset_TRAIN']
+METRICS = ['f1Macro', 'meanSquaredError', 'accuracy']
+TEMPLATES = ['xgb_template', 'random_forest_template', 'trivial_template']
+TUNERS = ['gp', 'gpei', 'uniform']
+# the first test run predates TEST_ID_START, so it is filtered out
+TEST_IDS = ['20181001000000000000', '20181024200501872083',
+            '20181101000000000000', '20181201000000000000']
+
+
+@pytest.fixture
+def db():
+    mongomock = pytest.importorskip('mongomock')
+    rng = np.random.RandomState(0)
+    db = mongomock.MongoClient().db
+    db.datasets.insert_many([
+        {'dataset': d.replace('_dataset_TRAIN', ''), 'dataset_id': d,
+         'data_modality': 'single_table', 'task_type': 'classification',
+         'task_subtype': 'binary'}
+        for d in DATASETS
+    ])
+    db.tests.insert_many([
+        {'test_id': test_id, 'dataset': dataset,
+         'tuner_type': TUNERS[(i + j) % len(TUNERS)]}
+        for i, test_id in enumerate(TEST_IDS)
+        for j, dataset in enumerate(DATASETS)
+    ])
+    db.test_results.insert_many([
+        {'test_id': test_id, 'dataset': dataset, 'metric': METRICS[j],
+         'pipeline': TEMPLATES[k], 'cv_score': float(rng.rand()),
+         'elapsed': float(rng.exponential(600)),
+         'iterations': int(rng.randint(1, 100))}
+        for test_id in TEST_IDS
+        for j, dataset in enumerate(DATASETS)
+        for k in range(len(TEMPLATES))
+        for _ in range(2)
+    ])
+    db.solutions.insert_many([
+        {'test_id': TEST_IDS[i % len(TEST_IDS)],
+         'dataset': DATASETS[i % len(DATASETS)],
+         'metric': METRICS[i % len(DATASETS)],
+         'name': TEMPLATES[i % len(TEMPLATES)],
+         'pipeline': 'template_id_{}'.format(i % 2),
+         'template': 'template_id_{}'.format(i % 2),
+         'loader': {'data_modality': 'single_table',
+                    'task_type': 'classification'},
+         'rank': float(rng.rand()), 'score': float(rng.rand()),
+         'ts': pd.Timestamp('2019-01-01').to_pydatetime()}
+        for i in range(100)
+    ])
+    return db
+
+
+@pytest.fixture
+def explorer(db, tmp_path, monkeypatch):
+    from piex.explorer import MongoPipelineExplorer
+    explorer = MongoPipelineExplorer(db, data_path=str(tmp_path))
+    monkeypatch.setattr(analysis, 'DATA_DIR', tmp_path)
+    analysis.ex.configure(explorer=explorer)
+    yield explorer
+    analysis.ex.configure(explorer=None)
+    for obj in vars(analysis).values():
+        if hasattr(obj, 'invalidate_all'):
+            obj.invalidate_all()
@@ -0,0 +1,55 @@
+"""Check that the reductions pushed down to Mongo match the pandas path"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analysis
+
+pytest.importorskip('mongomock')
+
+
+def _run_locally(monkeypatch, func, *args):
+    monkeypatch.setattr(analysis, '_can_push_down', lambda collection: False)
+    try:
+        return func(*args)
+    finally:
+        monkeypatch.undo()
+
+
+def test_count_pipelines(explorer):
+    assert analysis._can_push_down(analysis.PIPELINES_COLLECTION)
+    pipelines = explorer.get_pipelines(**analysis._get_filters())
+    assert analysis._count_pipelines() == len(pipelines)
+    for pattern in ['xgb', 'random_forest', 'template_id']:
+        expected = pipelines['pipeline'].str.contains(pattern).sum()
+        assert analysis._count_pipelines(pattern) == expected
+
+
+@pytest.mark.parametrize('column,pattern', [
+    ('pipeline', 'xgb'),
+    ('pipeline', 'random_forest'),
+    ('tuner_type', 'gp'),
+    ('tuner_type', 'uniform'),
+])
+def test_get_max_tscores(explorer, monkeypatch, column, pattern):
+    assert analysis._can_push_down(analysis.TEST_RESULTS_COLLECTION)
+    pushed = analysis._get_max_tscores(column, pattern)
+    local = _run_locally(
+        monkeypatch, analysis._get_max_tscores, column, pattern)
+
+    assert not local.empty
+    assert list(pushed.index) == list(local.index)
+    np.testing.assert_allclose(pushed.values, local.values.astype(float))
+
+
+def test_get_final_search_results(explorer, monkeypatch):
+    keys = ['test_id', 'dataset']
+    pushed = analysis._get_final_search_results()
+    local = _run_locally(monkeypatch, analysis._get_final_search_results)
+
+    pushed = pushed.sort_values(keys).reset_index(drop=True)
+    local = local.astype({k: object for k in keys})
+    local = local.sort_values(keys).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        pushed, local, check_dtype=False, check_categorical=False)
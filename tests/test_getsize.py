@@ -0,0 +1,52 @@
+"""Check getsize against the gc referents walk it replaces"""
+
+import io
+import sys
+from gc import get_referents
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analysis
+
+
+def _walk(obj):
+    seen_ids = set()
+    size = 0
+    objects = [obj]
+    while objects:
+        need_referents = []
+        for obj in objects:
+            if (not isinstance(obj, analysis.BLACKLIST)
+                    and id(obj) not in seen_ids):
+                seen_ids.add(id(obj))
+                size += sys.getsizeof(obj)
+                need_referents.append(obj)
+        objects = get_referents(*need_referents)
+    return size
+
+
+def _read_frame():
+    rng = np.random.RandomState(0)
+    n = 20000
+    df = pd.DataFrame({
+        'score': rng.rand(n),
+        'count': rng.randint(0, 100, n),
+        'name': ['name_{}'.format(i) for i in rng.randint(0, 5000, n)],
+        'metric': rng.choice(['f1', 'accuracy', 'meanSquaredError'], n),
+    })
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)))
+
+
+@pytest.mark.parametrize('sample', [None, 1000])
+def test_getsize_matches_walk(sample):
+    df = _read_frame()
+    expected = _walk(df)
+    # the walk caches the columns, so measure a frame that has none cached
+    size = analysis.getsize(_read_frame(), sample=sample)
+
+    tolerance = 16 * 2**10 + 2 * 2**10 * len(df.columns)
+    if sample is not None:
+        tolerance += 0.01 * expected
+    assert abs(size - expected) <= tolerance
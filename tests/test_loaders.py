@@ -0,0 +1,32 @@
+"""Check that loaders running in threads share their results"""
+
+import concurrent.futures
+import threading
+import time
+
+import analysis
+
+
+def test_memoize_computes_once_across_threads():
+    calls = []
+
+    @analysis.memoize
+    def load():
+        calls.append(threading.get_ident())
+        time.sleep(0.1)
+        return len(calls)
+
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        results = [f.result() for f in [pool.submit(load) for _ in range(4)]]
+
+    assert results == [1, 1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_prepare_runs_after_its_loaders():
+    loaders = analysis._get_loaders([
+        analysis.compute_total_pipelines, analysis.compute_pipelines_second])
+    assert loaders.index(analysis._ensure_pipelines_cache) < loaders.index(
+        analysis._prepare_pipelines)
+    assert loaders.index(analysis._get_test_results_df) < loaders.index(
+        analysis._prepare_test_results)
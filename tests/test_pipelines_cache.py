@@ -0,0 +1,78 @@
+"""Check that the pipelines cache serves what the explorer does"""
+
+import pandas as pd
+import pytest
+
+import analysis
+
+pytest.importorskip('mongomock')
+
+
+def _sorted(df):
+    return df.sort_values('_id').reset_index(drop=True)
+
+
+def test_download_matches_explorer(explorer):
+    analysis._download_pipelines_cache()
+    cached = _sorted(analysis._read_pipelines_cache())
+
+    expected = explorer.get_pipelines(**analysis._get_filters())
+    expected['_id'] = expected['_id'].map(str)
+    expected = _sorted(expected)
+
+    assert set(cached.columns) == set(expected.columns) | {'t-score'}
+    assert (cached['pipeline'] == cached['name']).all()
+    pd.testing.assert_frame_equal(
+        cached[expected.columns], expected, check_dtype=False)
+
+
+def test_download_in_batches(explorer, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setattr(analysis, 'PIPELINES_BATCH_SIZE', 7)
+        m.setattr(analysis, 'PIPELINES_CACHE_MAX_PARTS', 2)
+        analysis._download_pipelines_cache()
+    batched = _sorted(analysis._read_pipelines_cache())
+
+    manifest = analysis._read_manifest(analysis._get_pipelines_cache_dir())
+    assert all(len(f) == 1 for f in manifest['partitions'].values())
+    assert manifest['rows'] == len(batched)
+
+    analysis._download_pipelines_cache()
+    pd.testing.assert_frame_equal(
+        batched, _sorted(analysis._read_pipelines_cache()))
+
+
+def test_download_nothing(explorer, db):
+    db.solutions.delete_many({})
+    assert analysis._download_pipelines_cache() == 0
+    df = analysis._load_pipelines_df()
+    assert df.empty
+    assert 'test_id' in df
+
+
+def test_json_columns_apply_to_all_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis, 'DATA_DIR', tmp_path)
+    cache_dir = analysis._get_pipelines_cache_dir()
+    batches = [
+        pd.DataFrame({'dataset': ['a', 'b'], 'test_id': ['t1', 't1'],
+                      'extra': [{'x': 1}, None]}),
+        pd.DataFrame({'dataset': ['a', 'b'], 'test_id': ['t2', 't2'],
+                      'extra': ['"quoted"', None]}),
+    ]
+    cache_dir.mkdir(parents=True)
+    analysis._write_manifest(cache_dir, analysis._get_empty_manifest())
+    for df in batches:
+        analysis._append_pipelines_cache(df, cache_dir=cache_dir)
+
+    df = analysis._read_pipelines_cache().sort_values('test_id')
+    assert list(df['extra'].dropna()) == [{'x': 1}, '"quoted"']
+
+    analysis._append_pipelines_cache(
+        pd.DataFrame({'dataset': ['a'], 'test_id': ['t3'],
+                      'name': ['a string']}),
+        cache_dir=cache_dir)
+    with pytest.raises(ValueError, match='force_download'):
+        analysis._append_pipelines_cache(
+            pd.DataFrame({'dataset': ['a'], 'test_id': ['t4'],
+                          'name': [['not', 'a', 'string']]}),
+            cache_dir=cache_dir)
@@ -0,0 +1,92 @@
+"""Check the S3 object cache against a mocked bucket"""
+
+import gzip
+import io
+import json
+
+import botocore.session
+import pandas as pd
+import pytest
+
+import analysis
+
+moto = pytest.importorskip('moto')
+
+BUCKET = 'ml-pipelines'
+TABLES = {
+    'datasets': pd.DataFrame({'dataset': ['a', 'b'],
+                              'dataset_id': ['a_TRAIN', 'b_TRAIN']}),
+    'pipelines': pd.DataFrame({'dataset': ['a', 'b'], 'name': ['x', 'y'],
+                               'test_id': ['t1', 't2']}),
+}
+PIPELINES = {'p1': {'primitives': ['xgb']}, 'p2': {'primitives': ['sgd']}}
+
+
+def _gzip(data):
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb') as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    # moto 5 mocks every service with mock_aws
+    mock = getattr(moto, 'mock_aws', None) or moto.mock_s3
+    with mock():
+        client = botocore.session.get_session().create_client(
+            's3', region_name='us-east-1')
+        client.create_bucket(Bucket=BUCKET)
+        for name, df in TABLES.items():
+            client.put_object(
+                Bucket=BUCKET, Key='csvs/{}.csv.gz'.format(name),
+                Body=_gzip(df.to_csv(index=False).encode()))
+        for name, pipeline in PIPELINES.items():
+            client.put_object(
+                Bucket=BUCKET, Key='pipelines/{}.json.gz'.format(name),
+                Body=_gzip(json.dumps(pipeline).encode()))
+        yield client
+
+
+@pytest.fixture
+def store(client, tmp_path):
+    return analysis.S3ObjectStore(BUCKET, cache_dir=tmp_path, client=client)
+
+
+def test_fetch_once(store, client, tmp_path):
+    keys = ['pipelines/p1.json.gz', 'pipelines/p2.json.gz']
+    paths = store.fetch(keys)
+    assert sorted(paths) == keys
+
+    for key in keys:
+        client.delete_object(Bucket=BUCKET, Key=key)
+    cached = analysis.S3ObjectStore(BUCKET, cache_dir=tmp_path, client=client)
+    assert cached.fetch(keys) == paths
+
+
+def test_save_index_merges(client, tmp_path):
+    first = analysis.S3ObjectStore(BUCKET, cache_dir=tmp_path, client=client)
+    second = analysis.S3ObjectStore(BUCKET, cache_dir=tmp_path, client=client)
+    # both read the index before either saves it
+    first._get_index()
+    second._get_index()
+    first.fetch(['pipelines/p1.json.gz'])
+    second.fetch(['pipelines/p2.json.gz'])
+
+    with tmp_path.joinpath('index.json').open() as f:
+        index = json.load(f)
+    assert sorted(index) == [
+        BUCKET + '/pipelines/p1.json.gz', BUCKET + '/pipelines/p2.json.gz']
+
+
+def test_explorer_fetches_tables_lazily(store, tmp_path):
+    explorer = analysis.CachedS3PipelineExplorer(
+        BUCKET, data_path=str(tmp_path.joinpath('data')), store=store)
+
+    pipelines = explorer.get_pipelines()
+    assert list(pipelines['pipeline']) == list(TABLES['pipelines']['name'])
+    assert list(store._get_index()) == [BUCKET + '/csvs/pipelines.csv.gz']
+
+    assert explorer.load_pipelines(list(PIPELINES)) == PIPELINES
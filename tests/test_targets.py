@@ -0,0 +1,20 @@
+"""Check that the targets declare the output files they write"""
+
+import inspect
+import re
+
+import pytest
+
+import analysis
+
+
+@pytest.mark.parametrize(
+    'target', analysis._get_targets(), ids=lambda target: target.__name__)
+def test_writes_declares_outputs(target):
+    source = inspect.getsource(target)
+    written = set(re.findall(r"OUTPUT_DIR\.joinpath\('([^']+)'\)", source))
+    written |= {
+        name + '.{fmt}'
+        for name in re.findall(r"_savefig\(fig, '([^']+)'", source)
+    }
+    assert set(getattr(target, 'writes', ())) == written